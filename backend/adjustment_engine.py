@@ -1,16 +1,185 @@
 """Auto-adjustment algorithm for score modifications."""
 
 import logging
-from typing import Dict, List, Tuple, Optional
-import math
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple, Optional
 
-from backend.models import ScoreAdjustmentPreview, Metric
+import numpy as np
+
+from backend.models import ScoreAdjustmentPreview, RankingEntry
 from backend.data_manager import DataManager
-from backend.ranking_engine import RankingEngine
-from backend.config import settings
+from backend.ranking_engine import RankingEngine, RoleMetricTable
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel below runs as-is without it
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# Number of preview results kept per engine
+PREVIEW_CACHE_SIZE = 128
+
+# Up to this many free metrics, every choice of which to round up is tried
+EXACT_ROUNDING_LIMIT = 12
+
+
+def _ipf_clamp_kernel(weights: np.ndarray, min_values: np.ndarray, max_values: np.ndarray,
+                      current: np.ndarray, needed_delta: float, total_weight: float,
+                      max_shift: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    """Distribute a weighted score delta proportionally across metrics with clamping.
+
+    A proportional split by weight moves every unclamped metric by the same raw
+    amount, so the clamped distribution is solved directly: metrics are visited
+    by ascending headroom towards the bound in the direction of the change, and
+    each one whose share exceeds its headroom is clamped and its residual handed
+    to the rest. The free metrics are then rounded down or up to whole scores,
+    choosing the combination whose weighted delta is closest to the target and,
+    among equally close ones, rounding up the largest remainders. Combinations
+    that move the weighted score by ``max_shift`` or more in the direction of
+    the change are skipped, so rounding never reaches the bound member's score
+    (``np.inf`` when there is no bound).
+    ``total_weight`` is the sum of ``weights`` as already known to the caller;
+    the weight left after each clamp is derived from it rather than re-summed.
+
+    Returns the proposed scores, a mask of metrics that were adjusted, the order
+    in which each metric was clamped (-1 if never) and the achieved weighted delta.
+    """
+    n = weights.shape[0]
+    proposed = current.copy()
+    touched = np.zeros(n, dtype=np.bool_)
+    hit_order = np.full(n, -1, dtype=np.int64)
+
+    if needed_delta == 0:
+        return proposed, touched, hit_order, 0.0
+
+    direction = 1.0 if needed_delta > 0 else -1.0
+    bounds = max_values if needed_delta > 0 else min_values
+    headroom = np.maximum((bounds - current) * direction, 0.0)
+
+    # Only weighted metrics take part in the distribution
+    weighted = np.flatnonzero(weights != 0)
+    order = weighted[np.argsort(headroom[weighted], kind='mergesort')]
+
+    if order.shape[0] == 0:
+        return proposed, touched, hit_order, 0.0
+
+    # Residual and weight left for metric k once every metric before it has clamped
+    sorted_headroom = headroom[order]
+    sorted_weights = weights[order]
+    zero = np.zeros(1)
+    consumed = np.concatenate((zero, np.cumsum(sorted_headroom * sorted_weights)[:-1]))
+    left_weight = total_weight - np.concatenate((zero, np.cumsum(sorted_weights)[:-1]))
+    shifts = (abs(needed_delta) - consumed) / left_weight
+
+    # Metrics clamp as a prefix: stop at the first whose share fits its headroom
+    fits = shifts < sorted_headroom
+    n_clamped = np.argmax(fits) if fits.any() else order.shape[0]
+    shift = shifts[n_clamped] if n_clamped < order.shape[0] else 0.0
+    clamped = order[:n_clamped]
+    hit_order[clamped] = np.arange(n_clamped)
+    touched[order] = True
+
+    # Clamped metrics sit on their bound, the rest move by the common shift
+    sorted_current = current[order]
+    is_clamped = hit_order[order] >= 0
+    raw = np.clip(np.where(is_clamped, bounds[order], sorted_current + direction * shift),
+                  min_values[order], max_values[order])
+
+    # Round to whole scores: floor the free metrics, then round up the subset that
+    # brings the weighted delta closest to the target
+    rounded = np.where(is_clamped, np.round(raw), np.floor(raw))
+    fraction = raw - rounded
+    eligible = np.flatnonzero(~is_clamped & (fraction > 0))
+    by_fraction = eligible[np.argsort(-fraction[eligible], kind='mergesort')]
+    floor_delta = ((rounded - sorted_current) * sorted_weights).sum()
+    n_eligible = by_fraction.shape[0]
+    if n_eligible <= EXACT_ROUNDING_LIMIT:
+        # Every subset as a bit mask over the metrics in descending-remainder order
+        picks = ((np.arange(1 << n_eligible)[:, None] >> np.arange(n_eligible)) & 1) == 1
+        achieved = floor_delta + (picks * sorted_weights[by_fraction]).sum(axis=1)
+        gaps = np.abs(achieved - needed_delta)
+        # Rounding every metric towards its current score always stays short of the bound
+        gaps[direction * achieved >= max_shift] = np.inf
+        # Ties go to the subset closest to the unrounded scores
+        closest = np.flatnonzero(gaps <= gaps.min() + 1e-9)
+        deviation = (picks[closest] * (1.0 - 2.0 * fraction[by_fraction])).sum(axis=1)
+        round_up = by_fraction[picks[closest[np.argmin(deviation)]]]
+    else:
+        # Too many to try them all: round up the largest remainders first, as many as
+        # brings the weighted delta closest to the target
+        candidates = floor_delta + np.concatenate((zero, np.cumsum(sorted_weights[by_fraction])))
+        gaps = np.abs(candidates - needed_delta)
+        gaps[direction * candidates >= max_shift] = np.inf
+        round_up = by_fraction[:np.argmin(gaps)]
+    rounded[round_up] = rounded[round_up] + 1.0
+
+    # Only the distributed metrics contribute
+    proposed[order] = rounded
+    achieved_delta = ((rounded - sorted_current) * sorted_weights).sum()
+
+    return proposed, touched, hit_order, achieved_delta
+
+
+if njit is not None:
+    # nogil lets concurrent preview requests run the kernel on several threads at once
+    _ipf_clamp_kernel = njit(cache=True, nogil=True)(_ipf_clamp_kernel)
+    # Compile at import time so the JIT cost stays out of request latency
+    _ipf_clamp_kernel(np.ones(1), np.zeros(1), np.ones(1), np.zeros(1), 1.0, 1.0, np.inf)
+
+
+class RankingContext(NamedTuple):
+    """Rankings of a single role cohort, shared by previews until the data changes."""
+    rankings: List[RankingEntry]
+    weighted_scores: Dict[str, float]
+    ranks: List[int]  # Ascending ranks, aligned with ranked_aliases
+    ranked_aliases: List[str]
+    sorted_scores: Optional[List[float]]  # Ascending weighted scores of the cohort; None if any is NaN
+
+    def rank_with_score(self, member_alias: str, new_score: float) -> Optional[int]:
+        """Rank a member would get if only its weighted score changed, or None if not computable here.
+
+        With ties sharing the best position, a member's rank is one more than
+        the number of others scoring strictly higher, so it is read off the
+        sorted cohort scores without re-ranking anyone.
+        """
+        if self.sorted_scores is None or new_score != new_score:
+            return None
+
+        higher = len(self.sorted_scores) - bisect_right(self.sorted_scores, new_score)
+        # The member's own current score is in the list and does not count
+        if self.weighted_scores[member_alias] > new_score:
+            higher -= 1
+        return higher + 1
+
+    def get_reference_member(self, target_member: str, current_rank: int,
+                             expected_rank: int) -> Optional[str]:
+        """Same lookup as RankingEngine.get_reference_member, using the prebuilt rank index."""
+        if expected_rank == current_rank:
+            return None
+
+        target_ref_rank = max(expected_rank, 1) if expected_rank < current_rank else expected_rank
+
+        # First member at the target rank, or the next available rank after it
+        for alias in self.ranked_aliases[bisect_left(self.ranks, target_ref_rank):]:
+            if alias != target_member:
+                return alias
+
+        return None
+
+    def get_reference_members(self, target_member: str, current_rank: int,
+                              target_ranks: List[int]) -> Dict[int, Tuple[str, float]]:
+        """Resolve reference members and their weighted scores for several target ranks at once."""
+        references = {}
+        for rank in target_ranks:
+            alias = self.get_reference_member(target_member, current_rank, rank)
+            if alias:
+                references[rank] = (alias, self.weighted_scores[alias])
+        return references
+
 
 class AdjustmentEngine:
     """Handles automatic score adjustments with proportional distribution and clamping."""
@@ -18,24 +187,83 @@ class AdjustmentEngine:
     def __init__(self, data_manager: DataManager, ranking_engine: RankingEngine):
         self.data_manager = data_manager
         self.ranking_engine = ranking_engine
+
+        # (data version, per-role ranking contexts)
+        self._ranking_ctx_cache: Tuple[int, Dict[str, RankingContext]] = (-1, {})
+
+        # LRU of preview results keyed on (alias, metrics, percent, data version);
+        # previews are frozen, so cached instances are handed out as-is
+        self._preview_cache: "OrderedDict[tuple, ScoreAdjustmentPreview]" = OrderedDict()
+        self._preview_lock = threading.Lock()
+
+    def _cached_ranking_ctx(self, role: str) -> RankingContext:
+        """Get rankings, weighted scores and the rank index for a role, computed once per data version."""
+        version = self.data_manager.version
+        cache_version, cache = self._ranking_ctx_cache
+        if cache_version != version:
+            cache = {}
+
+        ctx = cache.get(role)
+        if ctx is None:
+            rankings, weighted_scores = self.ranking_engine.calculate_rankings_with_scores([role])
+            by_rank = sorted((r for r in rankings if r.role == role), key=attrgetter("rank"))
+            cohort_scores = [weighted_scores[r.alias] for r in by_rank]
+            ctx = RankingContext(
+                rankings=rankings,
+                weighted_scores=weighted_scores,
+                ranks=[r.rank for r in by_rank],
+                ranked_aliases=[r.alias for r in by_rank],
+                sorted_scores=None if any(s != s for s in cohort_scores) else sorted(cohort_scores)
+            )
+            # A write during the computation may have made ctx stale: return it, don't cache it
+            if self.data_manager.version == version:
+                cache = dict(cache)
+                cache[role] = ctx
+                self._ranking_ctx_cache = (version, cache)
+
+        return ctx
     
-    def preview_adjustment(self, member_alias: str, selected_metrics: List[str],
+    def preview_adjustment(self, member_alias: str, selected_metrics: Iterable[str],
                          target_percent: float) -> ScoreAdjustmentPreview:
         """Preview score adjustments to achieve target weighted score change.
 
         Restricts adjustments to move only one rank level at a time to prevent
-        members from jumping multiple ranks in a single adjustment.
+        members from jumping multiple ranks in a single adjustment. Results are
+        memoized until the underlying data changes.
         """
+        selected = frozenset(selected_metrics)
+        version = self.data_manager.version
+        key = (member_alias, selected, round(target_percent, 4), version)
+
+        with self._preview_lock:
+            cached = self._preview_cache.get(key)
+            if cached is not None:
+                self._preview_cache.move_to_end(key)
+                return cached
+
+        preview = self._compute_preview(member_alias, selected, target_percent)
+        if self.data_manager.version != version:
+            return preview
+
+        with self._preview_lock:
+            self._preview_cache[key] = preview
+            if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
+
+        return preview
+
+    def _compute_preview(self, member_alias: str, selected: frozenset,
+                         target_percent: float) -> ScoreAdjustmentPreview:
+        """Compute an adjustment preview without consulting the cache."""
         
         # Get member info
-        members = self.data_manager.get_members()
-        member = next((m for m in members if m.alias == member_alias), None)
+        member = self.data_manager.get_member_by_alias(member_alias)
         if not member:
             raise ValueError(f"Member not found: {member_alias}")
         
         # Get current rankings to find reference member
-        current_rankings = self.ranking_engine.calculate_rankings([member.role])
-        current_entry = next((r for r in current_rankings if r.alias == member_alias), None)
+        ctx = self._cached_ranking_ctx(member.role)
+        current_entry = next((r for r in ctx.rankings if r.alias == member_alias), None)
         if not current_entry:
             raise ValueError(f"Current ranking not found for member: {member_alias}")
         
@@ -43,6 +271,14 @@ class AdjustmentEngine:
         if current_entry.expected_rank is None:
             raise ValueError(f"No expected rank found for member: {member_alias}")
 
+        # Already at the expected rank: nothing to adjust
+        if current_entry.rank == current_entry.expected_rank:
+            return ScoreAdjustmentPreview(
+                proposed={},
+                achieved_weighted_score=ctx.weighted_scores[member_alias],
+                hit_clamps=[]
+            )
+
         # Determine direction and calculate one-level target rank
         move_up = current_entry.expected_rank < current_entry.rank
         if move_up:
@@ -56,76 +292,76 @@ class AdjustmentEngine:
                    f"expected_rank={current_entry.expected_rank}, one_level_target={one_level_target_rank}, "
                    f"move_up={move_up}")
 
-        # Get reference member at the one-level target rank
-        ref_member = self.ranking_engine.get_reference_member(
-            member_alias, member.role, current_entry.rank, one_level_target_rank
-        )
+        # Resolve the reference member and the bound member in one lookup
+        # Moving up to rank 1 has no member beyond the target to stay short of
+        bound_rank = one_level_target_rank - 1 if move_up else one_level_target_rank + 1
+        target_ranks = [one_level_target_rank, bound_rank] if bound_rank >= 1 else [one_level_target_rank]
+        references = ctx.get_reference_members(member_alias, current_entry.rank, target_ranks)
 
-        if not ref_member:
+        # Get reference member at the one-level target rank
+        if one_level_target_rank not in references:
             raise ValueError("No suitable reference member found for one-level adjustment")
 
         # Calculate target weighted score with percentage adjustment
-        ref_weighted_scores = self.ranking_engine.calculate_weighted_scores([ref_member], [member.role])
-        ref_score = ref_weighted_scores[ref_member]
+        ref_member, ref_score = references[one_level_target_rank]
 
         target_multiplier = 1 + (target_percent / 100) if move_up else 1 - (target_percent / 100)
         target_weighted_score = ref_score * target_multiplier
 
         # Apply upper bound restriction to prevent jumping multiple ranks
         original_target = target_weighted_score
+        bound_score = None
         if move_up:
             # When moving up, ensure we don't exceed the score of the member one rank better than target
-            upper_bound_rank = max(1, one_level_target_rank - 1)
-            upper_bound_member = self.ranking_engine.get_reference_member(
-                member_alias, member.role, current_entry.rank, upper_bound_rank
-            )
-            if upper_bound_member:
-                upper_bound_scores = self.ranking_engine.calculate_weighted_scores([upper_bound_member], [member.role])
-                upper_bound_score = upper_bound_scores[upper_bound_member]
+            if bound_rank in references:
+                upper_bound_member, upper_bound_score = references[bound_rank]
+                bound_score = upper_bound_score
                 # Ensure target doesn't exceed the upper bound (leave small gap to avoid ties)
                 target_weighted_score = min(target_weighted_score, upper_bound_score - 0.01)
                 if target_weighted_score < original_target:
                     logger.info(f"Applied upper bound restriction: original_target={original_target:.2f}, "
                                f"bounded_target={target_weighted_score:.2f}, upper_bound_member={upper_bound_member} "
-                               f"(rank {upper_bound_rank}) with score {upper_bound_score:.2f}")
+                               f"(rank {bound_rank}) with score {upper_bound_score:.2f}")
         else:
             # When moving down, ensure we don't go below the score of the member one rank worse than target
-            lower_bound_rank = one_level_target_rank + 1
-            lower_bound_member = self.ranking_engine.get_reference_member(
-                member_alias, member.role, current_entry.rank, lower_bound_rank
-            )
-            if lower_bound_member:
-                lower_bound_scores = self.ranking_engine.calculate_weighted_scores([lower_bound_member], [member.role])
-                lower_bound_score = lower_bound_scores[lower_bound_member]
+            if bound_rank in references:
+                lower_bound_member, lower_bound_score = references[bound_rank]
+                bound_score = lower_bound_score
                 # Ensure target doesn't go below the lower bound (leave small gap to avoid ties)
                 target_weighted_score = max(target_weighted_score, lower_bound_score + 0.01)
                 if target_weighted_score > original_target:
                     logger.info(f"Applied lower bound restriction: original_target={original_target:.2f}, "
                                f"bounded_target={target_weighted_score:.2f}, lower_bound_member={lower_bound_member} "
-                               f"(rank {lower_bound_rank}) with score {lower_bound_score:.2f}")
+                               f"(rank {bound_rank}) with score {lower_bound_score:.2f}")
         
         # Get current weighted score
-        current_weighted_scores = self.ranking_engine.calculate_weighted_scores([member_alias], [member.role])
-        current_weighted_score = current_weighted_scores[member_alias]
+        current_weighted_score = ctx.weighted_scores[member_alias]
         
         # Calculate needed delta
         needed_delta = target_weighted_score - current_weighted_score
+
+        # Rounded scores must stay short of the bound member, not just the unrounded target
+        if bound_score is None:
+            max_shift = np.inf
+        else:
+            max_shift = bound_score - current_weighted_score if move_up else current_weighted_score - bound_score
         
-        # Get applicable metrics and their weights
-        applicable_metrics = self.ranking_engine.get_applicable_metrics(member.role)
-        selected_applicable = [m for m in applicable_metrics if m.name in selected_metrics]
+        # Pick the selected metrics out of the role's metric table, in table order
+        table = self.ranking_engine.get_role_metric_table(member.role)
+        idx = np.array(sorted(table.name_to_idx[name] for name in selected if name in table.name_to_idx),
+                       dtype=np.int64)
         
-        if not selected_applicable:
+        if idx.size == 0:
             raise ValueError("No applicable metrics selected for adjustment")
         
         # Check if total weight is zero
-        total_weight = sum(m.weights_by_role.get(member.role, 0.0) for m in selected_applicable)
+        total_weight = table.weights[idx].sum()
         if total_weight == 0:
             raise ValueError("Selected metrics have zero total weight for this role")
         
         # Calculate proposed adjustments
         proposed_scores, achieved_score, hit_clamps = self._calculate_adjustments(
-            member_alias, selected_applicable, needed_delta, member.role
+            member_alias, table, idx, needed_delta, current_weighted_score, total_weight, max_shift
         )
         
         return ScoreAdjustmentPreview(
@@ -134,96 +370,55 @@ class AdjustmentEngine:
             hit_clamps=hit_clamps
         )
     
-    def _calculate_adjustments(self, member_alias: str, metrics: List[Metric], 
-                             needed_delta: float, role: str) -> Tuple[Dict[str, float], float, List[str]]:
-        """Calculate score adjustments with iterative refinement."""
+    def _calculate_adjustments(self, member_alias: str, table: RoleMetricTable, idx: np.ndarray,
+                             needed_delta: float, current_weighted_score: float,
+                             total_weight: Optional[float] = None,
+                             max_shift: float = np.inf) -> Tuple[Dict[str, float], float, List[str]]:
+        """Calculate score adjustments by proportional distribution with clamping.
+
+        ``max_shift`` is how far the weighted score may move before it reaches the
+        bound member's score; no rounding of the proposal goes that far.
+        """
         
         # Get current scores
-        member_scores = self.data_manager.get_member_scores()
-        current_scores = member_scores.get(member_alias, {})
+        current_scores = self.data_manager.get_scores_for(member_alias)
         
-        # Initialize tracking variables
-        proposed_scores = {}
-        hit_clamps = []
-        remaining_delta = needed_delta
-        
-        # Calculate initial proportional distribution
-        total_weight = sum(m.weights_by_role.get(role, 0.0) for m in metrics)
-        
-        for iteration in range(settings.MAX_ADJUSTMENT_ITERATIONS):
-            if abs(remaining_delta) < 0.001:  # Close enough
-                break
-            
-            # Calculate available metrics (not yet clamped)
-            available_metrics = [m for m in metrics if m.name not in hit_clamps]
-            if not available_metrics:
-                break
-            
-            available_weight = sum(m.weights_by_role.get(role, 0.0) for m in available_metrics)
-            if available_weight == 0:
-                break
-            
-            # Distribute remaining delta proportionally
-            for metric in available_metrics:
-                weight = metric.weights_by_role.get(role, 0.0)
-                if weight == 0:
-                    continue
-                
-                # Calculate proportional delta for this metric
-                metric_delta = remaining_delta * (weight / available_weight)
-                
-                # Convert to raw score adjustment
-                raw_score_delta = metric_delta / weight
-                
-                # Get current raw score
-                current_raw_score = current_scores.get(metric.name, 0.0)
-                if metric.name in proposed_scores:
-                    current_raw_score = proposed_scores[metric.name]
-                
-                # Calculate new raw score
-                new_raw_score = current_raw_score + raw_score_delta
-                
-                # Apply clamping
-                clamped_score = max(metric.min_value, min(metric.max_value, new_raw_score))
-
-                # Round the score to remove decimal places
-                rounded_score = round(clamped_score)
-
-                # Check if we hit a clamp (compare against the rounded value)
-                if abs(rounded_score - new_raw_score) > 0.001:
-                    if metric.name not in hit_clamps:
-                        hit_clamps.append(metric.name)
-
-                proposed_scores[metric.name] = rounded_score
-            
-            # Recalculate achieved delta
-            achieved_delta = 0.0
-            for metric in metrics:
-                weight = metric.weights_by_role.get(role, 0.0)
-                if weight == 0:
-                    continue
-                
-                old_score = current_scores.get(metric.name, 0.0)
-                new_score = proposed_scores.get(metric.name, old_score)
-                score_change = new_score - old_score
-                achieved_delta += score_change * weight
-            
-            remaining_delta = needed_delta - achieved_delta
-            
-            logger.debug(f"Iteration {iteration + 1}: achieved_delta={achieved_delta:.4f}, "
-                        f"remaining_delta={remaining_delta:.4f}, hit_clamps={hit_clamps}")
+        # Slice the selected metrics out of the role's metric table for the numeric kernel
+        names = [table.names[i] for i in idx]
+        weights = table.weights[idx]
+        min_values = table.mins[idx]
+        max_values = table.maxs[idx]
+        original = np.array([current_scores.get(name, 0.0) for name in names], dtype=np.float64)
+        if total_weight is None:
+            total_weight = weights.sum()
+
+        proposed, touched, hit_order, achieved_delta = _ipf_clamp_kernel(
+            weights, min_values, max_values, original, float(needed_delta), float(total_weight),
+            float(max_shift)
+        )
+        remaining_delta = needed_delta - achieved_delta
+
+        # Report clamped metrics in the order they were clamped
+        hit_clamps = [names[i] for i in np.argsort(hit_order) if hit_order[i] >= 0]
+        proposed_scores = {names[i]: float(proposed[i]) for i in np.flatnonzero(touched)}
+
+        logger.debug(f"Adjustment kernel: achieved_delta={achieved_delta:.4f}, "
+                    f"remaining_delta={remaining_delta:.4f}, hit_clamps={hit_clamps}")
         
         # Calculate final achieved weighted score
-        current_weighted_score = self.ranking_engine.calculate_weighted_scores([member_alias], [role])[member_alias]
         achieved_weighted_score = current_weighted_score + (needed_delta - remaining_delta)
         
         return proposed_scores, achieved_weighted_score, hit_clamps
     
     def get_adjustment_diff_table(self, member_alias: str, proposed_scores: Dict[str, float]) -> Dict[str, Dict[str, float]]:
         """Generate a diff table showing old, new, and delta values."""
-        member_scores = self.data_manager.get_member_scores()
-        current_scores = member_scores.get(member_alias, {})
-        
+        current_scores = self.data_manager.get_scores_for(member_alias)
+        return self._build_diff_table(current_scores, proposed_scores)
+    
+    @staticmethod
+    def _build_diff_table(current_scores: Dict[str, float],
+                          proposed_scores: Dict[str, float]) -> Dict[str, Dict[str, float]]:
+        """Build the old/new/delta table from already fetched current scores."""
         diff_table = {}
         
         for metric_name, new_score in proposed_scores.items():
@@ -238,76 +433,101 @@ class AdjustmentEngine:
         
         return diff_table
     
+    def compute_adjustment_bundle(self, member_alias: str, selected_metrics: Iterable[str],
+                                  target_percent: float) -> Dict[str, Any]:
+        """Preview an adjustment, check it is achievable and build its diff table in one pass.
+
+        Returns a dict with ``preview``, ``achievable`` (the same ``(bool, message)``
+        pair as validate_target_achievable) and ``diff_table``.
+        """
+        preview = self.preview_adjustment(member_alias, selected_metrics, target_percent)
+        current_scores = self.data_manager.get_scores_for(member_alias)
+
+        return {
+            'preview': preview,
+            'achievable': self._check_achievable(preview),
+            'diff_table': self._build_diff_table(current_scores, preview.proposed)
+        }
+    
     def validate_one_level_restriction(self, member_alias: str, proposed_changes: Dict[str, float]) -> Tuple[bool, str]:
         """Validate that proposed changes only move member by one rank level."""
         try:
             # Get member info
-            members = self.data_manager.get_members()
-            member = next((m for m in members if m.alias == member_alias), None)
+            member = self.data_manager.get_member_by_alias(member_alias)
             if not member:
                 return False, f"Member not found: {member_alias}"
 
             # Get current rankings
-            current_rankings = self.ranking_engine.calculate_rankings([member.role])
-            current_entry = next((r for r in current_rankings if r.alias == member_alias), None)
+            ctx = self._cached_ranking_ctx(member.role)
+            current_entry = next((r for r in ctx.rankings if r.alias == member_alias), None)
             if not current_entry:
                 return False, f"Current ranking not found for member: {member_alias}"
 
-            # Simulate the changes to calculate new rank
-            original_scores = self.data_manager.get_member_scores()
+            # Scores are persisted as whole numbers, so simulate the stored values
+            known_metrics = {m.name for m in self.data_manager.get_metrics()}
+            simulated_scores = {}
+            for metric_name, new_score in proposed_changes.items():
+                if metric_name not in known_metrics:
+                    return False, f"Metric not found: {metric_name}"
+                simulated_scores[metric_name] = round(new_score)
 
-            # Temporarily apply changes
-            self.data_manager.update_member_scores(member_alias, proposed_changes)
+            # Only this member's score changes, so its new rank follows from its new
+            # weighted score against the cached cohort scores
+            overrides = {member_alias: simulated_scores}
+            new_score = self.ranking_engine.calculate_weighted_scores(
+                [member_alias], [member.role], overrides=overrides
+            ).get(member_alias)
+            new_rank = None if new_score is None else ctx.rank_with_score(member_alias, new_score)
 
-            try:
-                # Calculate new rankings
-                new_rankings = self.ranking_engine.calculate_rankings([member.role])
+            if new_rank is None:
+                # Fall back to re-ranking the role without touching the stored scores
+                new_rankings = self.ranking_engine.simulate_rankings(member.role, overrides)
                 new_entry = next((r for r in new_rankings if r.alias == member_alias), None)
 
                 if not new_entry:
                     return False, "Could not calculate new ranking"
+                new_rank = new_entry.rank
 
-                # Check if the new rank is within one level of the expected rank
-                if current_entry.expected_rank is None:
-                    # If no expected rank is set, allow any single-level movement from current rank
-                    rank_change = current_entry.rank - new_entry.rank  # Positive = moved up, Negative = moved down
-                    if abs(rank_change) <= 1:
-                        return True, "One-level restriction satisfied (no expected rank set)"
-                    else:
-                        direction = "up" if rank_change > 0 else "down"
-                        return False, f"Proposed changes would move member {abs(rank_change)} ranks {direction} (from #{current_entry.rank} to #{new_entry.rank}). Only one-level movements are allowed."
+            # Check if the new rank is within one level of the expected rank
+            if current_entry.expected_rank is None:
+                # If no expected rank is set, allow any single-level movement from current rank
+                rank_change = current_entry.rank - new_rank  # Positive = moved up, Negative = moved down
+                if abs(rank_change) <= 1:
+                    return True, "One-level restriction satisfied (no expected rank set)"
                 else:
-                    # Check if new rank is within one level of expected rank
-                    expected_rank = current_entry.expected_rank
-                    rank_difference_from_expected = abs(new_entry.rank - expected_rank)
+                    direction = "up" if rank_change > 0 else "down"
+                    return False, f"Proposed changes would move member {abs(rank_change)} ranks {direction} (from #{current_entry.rank} to #{new_rank}). Only one-level movements are allowed."
+            else:
+                # Check if new rank is within one level of expected rank
+                expected_rank = current_entry.expected_rank
+                rank_difference_from_expected = abs(new_rank - expected_rank)
 
-                    if rank_difference_from_expected <= 1:
-                        return True, "One-level restriction satisfied"
-                    else:
-                        direction = "up" if new_entry.rank < expected_rank else "down"
-                        return False, f"Proposed changes would move member to rank #{new_entry.rank}, which is {rank_difference_from_expected} ranks away from expected rank #{expected_rank}. Only one-level movements from expected rank are allowed."
-
-            finally:
-                # Restore original scores
-                if member_alias in original_scores:
-                    self.data_manager.update_member_scores(member_alias, original_scores[member_alias])
+                if rank_difference_from_expected <= 1:
+                    return True, "One-level restriction satisfied"
+                else:
+                    direction = "up" if new_rank < expected_rank else "down"
+                    return False, f"Proposed changes would move member to rank #{new_rank}, which is {rank_difference_from_expected} ranks away from expected rank #{expected_rank}. Only one-level movements from expected rank are allowed."
 
         except Exception as e:
             logger.error(f"Error validating one-level restriction: {e}")
             return False, f"Validation error: {str(e)}"
 
-    def validate_target_achievable(self, member_alias: str, selected_metrics: List[str],
+    def validate_target_achievable(self, member_alias: str, selected_metrics: Iterable[str],
                                  target_percent: float) -> Tuple[bool, str]:
         """Validate if the target adjustment is theoretically achievable."""
         try:
             preview = self.preview_adjustment(member_alias, selected_metrics, target_percent)
-
-            # Check if we achieved close to the target
-            # This is a simplified check - in practice you'd compare against the actual target
-            if len(preview.hit_clamps) > 0:
-                return False, f"Target not fully achievable due to clamping on metrics: {', '.join(preview.hit_clamps)}"
-
-            return True, "Target is achievable"
+            return self._check_achievable(preview)
 
         except Exception as e:
             return False, str(e)
+
+    @staticmethod
+    def _check_achievable(preview: ScoreAdjustmentPreview) -> Tuple[bool, str]:
+        """Decide whether a preview reaches its target."""
+        # Check if we achieved close to the target
+        # This is a simplified check - in practice you'd compare against the actual target
+        if len(preview.hit_clamps) > 0:
+            return False, f"Target not fully achievable due to clamping on metrics: {', '.join(preview.hit_clamps)}"
+
+        return True, "Target is achievable"
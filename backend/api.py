@@ -1,12 +1,18 @@
 """API endpoints for the Team Stack Ranking Manager."""
 
+import asyncio
+import functools
+import inspect
 import logging
-import tempfile
-import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Query, Depends, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from typing import Callable, Iterator, List, Optional, Dict, Any, Tuple
+from fastapi import APIRouter, HTTPException, Query, Depends, UploadFile, File, Form, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import numpy as np
+import orjson
 import pandas as pd
 
 from backend.models import (
@@ -21,29 +27,47 @@ from backend.ranking_engine import RankingEngine
 from backend.adjustment_engine import AdjustmentEngine
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Global instances - will be injected by main.py
 _data_manager: Optional[DataManager] = None
 _ranking_engine: Optional[RankingEngine] = None
 _adjustment_engine: Optional[AdjustmentEngine] = None
 
+# Snapshot labels: a four-digit year and half, e.g. 2024H1
+_SNAPSHOT_RE = re.compile(r'\d{4}H[12]')
 
-def get_data_manager() -> DataManager:
+# LRU of serialized GET responses keyed by endpoint (and query), stored with their ETag
+RESPONSE_CACHE_SIZE = 32
+_response_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Cache headers for data-derived GET responses; /scores varies its body by Accept (JSON or NDJSON)
+_REVALIDATE_HEADERS = {"Cache-Control": "no-cache", "Vary": "Accept"}
+
+# Applies arriving within this window are written back with a single save
+APPLY_BATCH_WINDOW = 0.05
+
+# Pending applies as (request, data manager, ranking engine, adjustment engine, future)
+_pending_applies: List[Tuple[Any, ...]] = []
+_apply_drain_task: Optional["asyncio.Task[None]"] = None
+
+
+async def get_data_manager() -> DataManager:
     """Dependency to get data manager instance."""
     if _data_manager is None:
         raise HTTPException(status_code=500, detail="Data manager not initialized")
     return _data_manager
 
 
-def get_ranking_engine() -> RankingEngine:
+async def get_ranking_engine() -> RankingEngine:
     """Dependency to get ranking engine instance."""
     if _ranking_engine is None:
         raise HTTPException(status_code=500, detail="Ranking engine not initialized")
     return _ranking_engine
 
 
-def get_adjustment_engine() -> AdjustmentEngine:
+async def get_adjustment_engine() -> AdjustmentEngine:
     """Dependency to get adjustment engine instance."""
     if _adjustment_engine is None:
         raise HTTPException(status_code=500, detail="Adjustment engine not initialized")
@@ -56,117 +80,237 @@ def init_engines(data_manager: DataManager):
     _data_manager = data_manager
     _ranking_engine = RankingEngine(data_manager)
     _adjustment_engine = AdjustmentEngine(data_manager, _ranking_engine)
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+async def _run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking data manager I/O on the default executor so the event loop keeps serving."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+@functools.lru_cache(maxsize=None)
+def _class_supports(cls: type, method: str, param: Optional[str] = None) -> bool:
+    """Whether cls defines method (accepting param, if given); probed once per class."""
+    func = getattr(cls, method, None)
+    if func is None:
+        return False
+    if param is None:
+        return True
+    # Parameters only; co_varnames would also match local variables
+    try:
+        return param in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _supports(obj: Any, method: str, param: Optional[str] = None) -> bool:
+    """Capability check for data managers and engines, which differ by backend."""
+    return _class_supports(type(obj), method, param)
 
 
+def _cached_json_response(request: Request, cache_key: Optional[str], data_manager: DataManager,
+                          build: Callable[[], Any], tag: str = "") -> Response:
+    """Serve a JSON body that only changes with the data version, honouring If-None-Match.
+
+    ``tag`` names anything else the body depends on, such as the current snapshot;
+    a ``cache_key`` of None serves the body without caching it.
+    """
+    etag = _etag_for(data_manager, tag)
+    # Revalidate on every use: the frontend refetches right after its own writes,
+    # and a matching ETag still answers with an empty 304
+    headers = {"ETag": etag, **_REVALIDATE_HEADERS}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    body = _cached_body(cache_key, data_manager, build, tag)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag_for(data_manager: DataManager, tag: str = "") -> str:
+    """ETag for the current data version, plus any tag the body depends on."""
+    # The manager id keeps ETags from colliding when the data source is swapped
+    return f'"{id(data_manager):x}-{data_manager.version}{tag}"'
+
+
+def _cached_body(cache_key: Optional[str], data_manager: DataManager, build: Callable[[], Any],
+                 tag: str = "") -> bytes:
+    """Return the serialized body for cache_key, rebuilding it if the data version or tag moved."""
+    etag = _etag_for(data_manager, tag)
+    if cache_key is not None:
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+            if cached is not None and cached[0] == etag:
+                _response_cache.move_to_end(cache_key)
+                return cached[1]
+
+    body = orjson.dumps(build(), option=orjson.OPT_SERIALIZE_NUMPY)
+    if cache_key is not None:
+        with _response_cache_lock:
+            _response_cache[cache_key] = (etag, body)
+            _response_cache.move_to_end(cache_key)
+            if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+    return body
+
+
+def warm_caches() -> None:
+    """Precompute rankings, mismatches and percentiles so first requests hit warm caches."""
+    if _data_manager is None or _ranking_engine is None:
+        return
+    _ranking_engine.calculate_rankings()
+    _ranking_engine.get_mismatches()
+    for basis in ("weighted", "rank"):
+        _cached_body(f"percentiles:{basis}", _data_manager,
+                     lambda: _build_percentiles(_data_manager, _ranking_engine, basis))
+
 
 
 
 @router.get("/roles")
-async def get_roles(data_manager: DataManager = Depends(get_data_manager)) -> Dict[str, Any]:
+async def get_roles(request: Request, data_manager: DataManager = Depends(get_data_manager)) -> Dict[str, Any]:
     """Get all roles and their member counts."""
     try:
-        roles = data_manager.get_roles()
-        counts_by_role = data_manager.get_role_counts()
-        
-        return {
-            "roles": roles,
-            "countsByRole": counts_by_role
-        }
+        def build() -> Dict[str, Any]:
+            roles = data_manager.get_roles()
+            counts_by_role = data_manager.get_role_counts()
+
+            return {
+                "roles": roles,
+                "countsByRole": counts_by_role
+            }
+
+        return _cached_json_response(request, "roles", data_manager, build)
     except Exception as e:
-        logger.error(f"Error getting roles: {e}")
+        logger.error("Error getting roles: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get roles")
 
 
 @router.get("/members")
-async def get_members(data_manager: DataManager = Depends(get_data_manager)) -> List[Member]:
+async def get_members(request: Request, data_manager: DataManager = Depends(get_data_manager)) -> List[Member]:
     """Get all team members."""
     try:
-        return data_manager.get_members()
+        return _cached_json_response(
+            request, "members", data_manager,
+            lambda: [m.model_dump() for m in data_manager.get_members()]
+        )
     except Exception as e:
-        logger.error(f"Error getting members: {e}")
+        logger.error("Error getting members: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get members")
 
 
 @router.get("/metrics")
-async def get_metrics(data_manager: DataManager = Depends(get_data_manager)) -> List[Metric]:
+async def get_metrics(request: Request, data_manager: DataManager = Depends(get_data_manager)) -> List[Metric]:
     """Get all metrics with role weights and bounds."""
     try:
-        return data_manager.get_metrics()
+        return _cached_json_response(
+            request, "metrics", data_manager,
+            lambda: [m.model_dump() for m in data_manager.get_metrics()]
+        )
     except Exception as e:
-        logger.error(f"Error getting metrics: {e}")
+        logger.error("Error getting metrics: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get metrics")
 
 
 @router.get("/scores")
 async def get_scores(
+    request: Request,
     snapshot: Optional[str] = Query(None, description="Snapshot to retrieve scores for (YYYYH1 or YYYYH2)"),
     data_manager: DataManager = Depends(get_data_manager)
 ) -> Dict[str, Any]:
     """Get all member scores for all metrics, optionally filtered by snapshot."""
     try:
-        metrics = data_manager.get_metrics()
-        members = data_manager.get_members()
+        # Get current snapshot if supported; it rolls over with the date, not the data version
+        current_snapshot = None
+        if _supports(data_manager, 'get_current_snapshot'):
+            current_snapshot = data_manager.get_current_snapshot()
 
-        # Check if data manager supports snapshot parameter
-        if hasattr(data_manager, 'get_member_scores') and 'snapshot' in data_manager.get_member_scores.__code__.co_varnames:
-            member_scores = data_manager.get_member_scores(snapshot=snapshot)
-        else:
-            member_scores = data_manager.get_member_scores()
+        def build() -> Dict[str, Any]:
+            metrics = data_manager.get_metrics()
+            members = data_manager.get_members()
+
+            # Check if data manager supports snapshot parameter
+            if _supports(data_manager, 'get_member_scores', 'snapshot'):
+                member_scores = data_manager.get_member_scores(snapshot=snapshot)
+            else:
+                member_scores = data_manager.get_member_scores()
+
+            # Get available snapshots if supported
+            available_snapshots = []
+            if _supports(data_manager, 'get_available_snapshots'):
+                available_snapshots = data_manager.get_available_snapshots()
+
+            return {
+                "metrics": [m.name for m in metrics],
+                "members": [m.alias for m in members],
+                "scores": member_scores,
+                "current_snapshot": current_snapshot,
+                "available_snapshots": available_snapshots,
+                "requested_snapshot": snapshot
+            }
 
-        # Get available snapshots if supported
-        available_snapshots = []
-        if hasattr(data_manager, 'get_available_snapshots'):
-            available_snapshots = data_manager.get_available_snapshots()
+        # Clients asking for NDJSON get a header line followed by one line per member
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            payload = build()
+            member_scores = payload.pop("scores")
 
-        # Get current snapshot if supported
-        current_snapshot = None
-        if hasattr(data_manager, 'get_current_snapshot'):
-            current_snapshot = data_manager.get_current_snapshot()
+            def lines() -> Iterator[bytes]:
+                yield orjson.dumps(payload) + b"\n"
+                for alias, row in member_scores.items():
+                    yield orjson.dumps({"alias": alias, "scores": row}, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
 
-        return {
-            "metrics": [m.name for m in metrics],
-            "members": [m.alias for m in members],
-            "scores": member_scores,
-            "current_snapshot": current_snapshot,
-            "available_snapshots": available_snapshots,
-            "requested_snapshot": snapshot
-        }
+            return StreamingResponse(lines(), media_type="application/x-ndjson", headers=_REVALIDATE_HEADERS)
+
+        # The current snapshot is part of the ETag; malformed snapshots are served uncached
+        cache_key = f"scores:{snapshot}" if snapshot is None or _SNAPSHOT_RE.fullmatch(snapshot) else None
+        return _cached_json_response(request, cache_key, data_manager, build, tag=f"-{current_snapshot}")
     except Exception as e:
-        logger.error(f"Error getting scores: {e}")
+        logger.error("Error getting scores: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get scores")
 
 
 @router.get("/rankings")
 async def get_rankings(
-    roles: Optional[str] = Query(None, description="Comma-separated list of roles"),
+    roles: Optional[List[str]] = Query(None, description="Roles to rank; repeat the parameter or comma-separate"),
     snapshot: Optional[str] = Query(None, description="Snapshot to calculate rankings for (YYYYH1 or YYYYH2)"),
     ranking_engine: RankingEngine = Depends(get_ranking_engine)
 ) -> List[RankingEntry]:
     """Get rankings for specified roles, optionally filtered by snapshot."""
     try:
         role_list = None
-        if roles:
-            role_list = [r.strip() for r in roles.split(",") if r.strip()]
+        if roles and any(roles):
+            # Repeated ?roles= values arrive as a list; still accept the comma-separated form
+            role_list = [r.strip() for value in roles for r in value.split(",") if r.strip()]
 
         # Check if ranking engine supports snapshot parameter
-        if hasattr(ranking_engine, 'calculate_rankings') and 'snapshot' in ranking_engine.calculate_rankings.__code__.co_varnames:
-            return ranking_engine.calculate_rankings(role_list, snapshot=snapshot)
+        if _supports(ranking_engine, 'calculate_rankings', 'snapshot'):
+            rankings = ranking_engine.calculate_rankings(role_list, snapshot=snapshot)
         else:
-            return ranking_engine.calculate_rankings(role_list)
+            rankings = ranking_engine.calculate_rankings(role_list)
+
+        # Entries are already validated models; skip the response_model pass
+        return ORJSONResponse([r.model_dump() for r in rankings])
     except Exception as e:
-        logger.error(f"Error getting rankings: {e}")
+        logger.error("Error getting rankings: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get rankings")
 
 
 @router.get("/mismatches")
 async def get_mismatches(
+    request: Request,
+    data_manager: DataManager = Depends(get_data_manager),
     ranking_engine: RankingEngine = Depends(get_ranking_engine)
 ) -> List[RankingEntry]:
     """Get ordered list of members with rank ≠ expected rank."""
     try:
-        return ranking_engine.get_mismatches()
+        return _cached_json_response(
+            request, "mismatches", data_manager,
+            lambda: [r.model_dump() for r in ranking_engine.get_mismatches()]
+        )
     except Exception as e:
-        logger.error(f"Error getting mismatches: {e}")
+        logger.error("Error getting mismatches: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get mismatches")
 
 
@@ -177,10 +321,10 @@ async def get_snapshots(data_manager: DataManager = Depends(get_data_manager)) -
         available_snapshots = []
         current_snapshot = None
 
-        if hasattr(data_manager, 'get_available_snapshots'):
+        if _supports(data_manager, 'get_available_snapshots'):
             available_snapshots = data_manager.get_available_snapshots()
 
-        if hasattr(data_manager, 'get_current_snapshot'):
+        if _supports(data_manager, 'get_current_snapshot'):
             current_snapshot = data_manager.get_current_snapshot()
 
         return {
@@ -188,7 +332,7 @@ async def get_snapshots(data_manager: DataManager = Depends(get_data_manager)) -
             "available_snapshots": available_snapshots
         }
     except Exception as e:
-        logger.error(f"Error getting snapshots: {e}")
+        logger.error("Error getting snapshots: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get snapshots")
 
 
@@ -199,16 +343,18 @@ async def preview_adjustment(
 ) -> ScoreAdjustmentPreview:
     """Preview score adjustments for a member."""
     try:
-        return adjustment_engine.preview_adjustment(
+        preview = adjustment_engine.preview_adjustment(
             request.alias,
             request.selected_metrics,
             request.percent
         )
+        # The preview is already well-formed; skip the response_model pass
+        return ORJSONResponse(preview.model_dump())
     except ValueError as e:
-        logger.warning(f"Invalid adjustment request: {e}")
+        logger.warning("Invalid adjustment request: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error previewing adjustment: {e}")
+        logger.error("Error previewing adjustment: %s", e)
         raise HTTPException(status_code=500, detail="Failed to preview adjustment")
 
 
@@ -220,119 +366,188 @@ async def apply_adjustment(
     adjustment_engine: AdjustmentEngine = Depends(get_adjustment_engine)
 ) -> Dict[str, Any]:
     """Apply score changes and save to Excel."""
+    global _apply_drain_task
     try:
-        # Validate one-level restriction before applying changes
-        is_valid, validation_message = adjustment_engine.validate_one_level_restriction(
-            request.alias, request.changes
-        )
-
-        if not is_valid:
-            logger.warning(f"One-level restriction violated for {request.alias}: {validation_message}")
-            raise HTTPException(status_code=400, detail=validation_message)
-
-        # Update member scores with snapshot support
-        if hasattr(data_manager, 'update_member_scores') and 'snapshot' in data_manager.update_member_scores.__code__.co_varnames:
-            data_manager.update_member_scores(request.alias, request.changes, snapshot=request.snapshot)
-        else:
-            data_manager.update_member_scores(request.alias, request.changes)
-
-        # Save data
-        data_manager.save_data()
-
-        # Get updated rankings with snapshot support
-        if hasattr(ranking_engine, 'calculate_rankings') and 'snapshot' in ranking_engine.calculate_rankings.__code__.co_varnames:
-            updated_rankings = ranking_engine.calculate_rankings(snapshot=request.snapshot)
-        else:
-            updated_rankings = ranking_engine.calculate_rankings()
-
-        return {
-            "ok": True,
-            "updatedAt": "now",  # In a real app, you'd use actual timestamp
-            "rankings": updated_rankings,
-            "snapshot": request.snapshot
-        }
+        # Queue the change; one drain task applies each burst in order and saves once
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        _pending_applies.append((request, data_manager, ranking_engine, adjustment_engine, future))
+        if _apply_drain_task is None or _apply_drain_task.done():
+            _apply_drain_task = loop.create_task(_drain_pending_applies())
+        return ORJSONResponse(await future)
     except HTTPException:
         raise  # Re-raise HTTP exceptions (like validation errors)
     except ValueError as e:
-        logger.warning(f"Invalid apply request: {e}")
+        logger.warning("Invalid apply request: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error applying adjustment: {e}")
+        logger.error("Error applying adjustment: %s", e)
         raise HTTPException(status_code=500, detail="Failed to apply adjustment")
 
 
+def _rankings_for_snapshot(ranking_engine: RankingEngine, snapshot: Optional[str]) -> List[RankingEntry]:
+    """Get rankings with snapshot support."""
+    if _supports(ranking_engine, 'calculate_rankings', 'snapshot'):
+        return ranking_engine.calculate_rankings(snapshot=snapshot)
+    return ranking_engine.calculate_rankings()
+
+
+async def _drain_pending_applies() -> None:
+    """Apply queued adjustments in batches until the queue stays empty."""
+    while _pending_applies:
+        await asyncio.sleep(APPLY_BATCH_WINDOW)
+        batch = list(_pending_applies)
+        _pending_applies.clear()
+        try:
+            await _apply_batch(batch)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def _apply_one(request: ScoreAdjustmentApply, data_manager: DataManager, ranking_engine: RankingEngine,
+               adjustment_engine: AdjustmentEngine) -> Tuple[int, List[Dict[str, Any]]]:
+    """Validate and apply one change; return the data version and the ranking rows it moved."""
+    # Validate against the data as left by the earlier changes in this batch
+    is_valid, validation_message = adjustment_engine.validate_one_level_restriction(
+        request.alias, request.changes
+    )
+
+    if not is_valid:
+        logger.warning("One-level restriction violated for %s: %s", request.alias, validation_message)
+        raise HTTPException(status_code=400, detail=validation_message)
+
+    # Remember rank and score per member so only changed rows are returned
+    previous = {r.alias: (r.rank, r.weighted_score)
+                for r in _rankings_for_snapshot(ranking_engine, request.snapshot)}
+
+    # Update member scores with snapshot support
+    if _supports(data_manager, 'update_member_scores', 'snapshot'):
+        data_manager.update_member_scores(request.alias, request.changes, snapshot=request.snapshot)
+    else:
+        data_manager.update_member_scores(request.alias, request.changes)
+
+    # Return only this change's ranking rows whose rank or weighted score moved,
+    # before later changes in the batch land; rankings are cached per version
+    version = data_manager.version
+    delta = [r.model_dump() for r in _rankings_for_snapshot(ranking_engine, request.snapshot)
+             if previous.get(r.alias) != (r.rank, r.weighted_score)]
+    return version, delta
+
+
+async def _apply_batch(batch: List[Tuple[Any, ...]]) -> None:
+    """Validate and apply each queued change in order, then save every touched manager once."""
+    applied = []
+    for item in batch:
+        request, data_manager, ranking_engine, adjustment_engine, future = item
+        try:
+            # Validation and ranking are CPU-bound; keep them off the event loop
+            version, delta = await _run_blocking(_apply_one, request, data_manager, ranking_engine,
+                                                 adjustment_engine)
+            applied.append((item, version, delta))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+    # Save data once per data manager touched by the batch
+    failed: Dict[int, Exception] = {}
+    for data_manager in {id(item[1]): item[1] for item, _, _ in applied}.values():
+        try:
+            await _run_blocking(data_manager.save_data)
+        except Exception as e:
+            failed[id(data_manager)] = e
+
+    for (request, data_manager, _, _, future), version, delta in applied:
+        if future.done():
+            continue  # The caller went away; the change itself is already saved
+        if id(data_manager) in failed:
+            future.set_exception(failed[id(data_manager)])
+            continue
+        future.set_result({
+            "ok": True,
+            "updatedAt": "now",  # In a real app, you'd use actual timestamp
+            "version": version,
+            "delta": delta,
+            "snapshot": request.snapshot
+        })
+
+
 @router.get("/percentiles")
 async def get_percentiles(
+    request: Request,
     basis: str = Query("weighted", regex="^(weighted|rank)$", description="Basis for percentiles: 'weighted' or 'rank'"),
+    data_manager: DataManager = Depends(get_data_manager),
     ranking_engine: RankingEngine = Depends(get_ranking_engine)
 ) -> Dict[str, List[PercentileBucket]]:
     """Get organizational percentiles by role."""
     try:
-        rankings = ranking_engine.calculate_rankings()
-        roles = list(set(r.role for r in rankings))
-
-        buckets = []
-
-        for pct in range(10, 101, 10):  # 10%, 20%, ..., 100%
-            bucket_data = {}
-
-            for role in roles:
-                role_rankings = [r for r in rankings if r.role == role]
-                if not role_rankings:
-                    bucket_data[role] = []
-                    continue
-
-                # Sort by the chosen basis
-                if basis == "weighted":
-                    role_rankings.sort(key=lambda x: -x.weighted_score)  # Descending
-                    # Calculate percentile threshold
-                    threshold_idx = int((pct / 100.0) * len(role_rankings)) - 1
-                    threshold_idx = max(0, min(threshold_idx, len(role_rankings) - 1))
-
-                    # Get members in this percentile bucket
-                    if pct == 10:
-                        bucket_members = role_rankings[:threshold_idx + 1]
-                    else:
-                        prev_threshold_idx = int(((pct - 10) / 100.0) * len(role_rankings)) - 1
-                        prev_threshold_idx = max(0, min(prev_threshold_idx, len(role_rankings) - 1))
-                        bucket_members = role_rankings[prev_threshold_idx + 1:threshold_idx + 1]
-                else:  # basis == "rank"
-                    role_rankings.sort(key=lambda x: x.rank)  # Ascending
-                    # For rank-based, we use rank ranges
-                    max_rank = max(r.rank for r in role_rankings)
-                    rank_threshold = int((pct / 100.0) * max_rank)
-
-                    if pct == 10:
-                        bucket_members = [r for r in role_rankings if r.rank <= rank_threshold]
-                    else:
-                        prev_rank_threshold = int(((pct - 10) / 100.0) * max_rank)
-                        bucket_members = [r for r in role_rankings if prev_rank_threshold < r.rank <= rank_threshold]
-
-                # Format member data
-                member_data = []
-                for member in bucket_members:
-                    if basis == "weighted":
-                        member_data.append({
-                            "alias": member.alias,
-                            "weightedScore": member.weighted_score
-                        })
-                    else:
-                        member_data.append({
-                            "alias": member.alias,
-                            "rank": member.rank
-                        })
-
-                bucket_data[role] = member_data
-
-            buckets.append(PercentileBucket(pct=pct, by_role=bucket_data))
-
-        return {"buckets": buckets}
-
+        return _cached_json_response(
+            request, f"percentiles:{basis}", data_manager,
+            lambda: _build_percentiles(data_manager, ranking_engine, basis)
+        )
     except Exception as e:
-        logger.error(f"Error getting percentiles: {e}")
+        logger.error("Error getting percentiles: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get percentiles")
 
 
+def _build_percentiles(data_manager: DataManager, ranking_engine: RankingEngine, basis: str) -> Dict[str, Any]:
+    """Split each role cohort into ten percentile buckets."""
+    rankings = ranking_engine.calculate_rankings()
+
+    # Group by role once, in the data manager's canonical role order
+    by_role: Dict[str, List[RankingEntry]] = {role: [] for role in data_manager.get_roles()}
+    for entry in rankings:
+        by_role.setdefault(entry.role, []).append(entry)
+
+    pcts = np.arange(10, 101, 10)  # 10%, 20%, ..., 100%
+    edge_pcts = np.arange(0, 101, 10)  # Bucket k spans edge_pcts[k]..edge_pcts[k + 1]
+
+    # Per role: members in basis order and the [start, end) slice of every bucket
+    bucket_slices: Dict[str, Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]] = {}
+    for role, role_rankings in by_role.items():
+        count = len(role_rankings)
+        if count == 0:
+            bucket_slices[role] = ([], np.zeros(len(pcts), dtype=np.int64), np.zeros(len(pcts), dtype=np.int64))
+            continue
+
+        if basis == "weighted":
+            values = np.fromiter((r.weighted_score for r in role_rankings), dtype=np.float64, count=count)
+            order = np.argsort(-values, kind="stable")  # Descending
+
+            # Percentile edges as member counts in integer math; every bucket edge keeps
+            # at least the top member so small cohorts still fill the first bucket
+            edges = np.maximum(edge_pcts * count // 100, 1)
+            starts, ends = edges[:-1], edges[1:]
+            starts[0] = 0
+        else:  # basis == "rank"
+            values = np.fromiter((r.rank for r in role_rankings), dtype=np.int64, count=count)
+            order = np.argsort(values, kind="stable")  # Ascending
+            sorted_ranks = values[order]
+
+            # For rank-based, we use rank ranges
+            max_rank = sorted_ranks[-1]
+            edges = np.searchsorted(sorted_ranks, edge_pcts * max_rank // 100, side="right")
+            starts, ends = edges[:-1], edges[1:]
+
+        # Format member data once per role in basis order from the values already
+        # extracted above; buckets are slices of it
+        value_key = "weightedScore" if basis == "weighted" else "rank"
+        aliases = [r.alias for r in role_rankings]
+        ordered = order.tolist()
+        rows = [{"alias": aliases[i], value_key: value}
+                for i, value in zip(ordered, values[order].tolist())]
+        bucket_slices[role] = (rows, starts, ends)
+
+    # Plain dicts in PercentileBucket's dump shape; the rows are already well-formed
+    buckets = [
+        {"pct": int(pct),
+         "by_role": {role: rows[starts[i]:ends[i]] for role, (rows, starts, ends) in bucket_slices.items()}}
+        for i, pct in enumerate(pcts)
+    ]
+    return {"buckets": buckets}
+
+
 # Database Management Endpoints
 @router.get("/data-source")
 async def get_data_source() -> Dict[str, Any]:
@@ -340,7 +555,7 @@ async def get_data_source() -> Dict[str, Any]:
     try:
         return get_data_source_info()
     except Exception as e:
-        logger.error(f"Error getting data source info: {e}")
+        logger.error("Error getting data source info: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get data source info")
 
 
@@ -354,8 +569,8 @@ async def migrate_to_sqlite(data_manager: DataManager = Depends(get_data_manager
 
         # Create SQLite data manager and migrate
         from backend.config import settings
-        sqlite_manager = SQLiteDataManager(settings.SQLITE_PATH)
-        sqlite_manager.migrate_from_csv(data_manager)
+        sqlite_manager = await _run_blocking(SQLiteDataManager, settings.SQLITE_PATH)
+        await _run_blocking(sqlite_manager.migrate_from_csv, data_manager)
 
         return {
             "ok": True,
@@ -365,7 +580,7 @@ async def migrate_to_sqlite(data_manager: DataManager = Depends(get_data_manager
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error migrating to SQLite: {e}")
+        logger.error("Error migrating to SQLite: %s", e)
         raise HTTPException(status_code=500, detail="Failed to migrate data to SQLite")
 
 
@@ -376,7 +591,7 @@ async def seed_mock_data(data_manager: DataManager = Depends(get_data_manager))
         if not isinstance(data_manager, SQLiteDataManager):
             raise HTTPException(status_code=400, detail="Mock data seeding only available for SQLite data source")
 
-        data_manager.seed_mock_data()
+        await _run_blocking(data_manager.seed_mock_data)
 
         return {
             "ok": True,
@@ -386,7 +601,7 @@ async def seed_mock_data(data_manager: DataManager = Depends(get_data_manager))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error seeding mock data: {e}")
+        logger.error("Error seeding mock data: %s", e)
         raise HTTPException(status_code=500, detail="Failed to seed mock data")
 
 
@@ -394,8 +609,7 @@ async def seed_mock_data(data_manager: DataManager = Depends(get_data_manager))
 async def upload_excel_data(
     file: UploadFile = File(...),
     snapshot: str = Form(...),
-    data_manager: DataManager = Depends(get_data_manager),
-    ranking_engine: RankingEngine = Depends(get_ranking_engine)
+    data_manager: DataManager = Depends(get_data_manager)
 ) -> Dict[str, Any]:
     """Upload Excel file to replace data for a specific snapshot."""
     try:
@@ -404,122 +618,88 @@ async def upload_excel_data(
             raise HTTPException(status_code=400, detail="File must be an Excel file (.xlsx or .xls)")
 
         # Validate snapshot format (YYYYH1 or YYYYH2)
-        if not snapshot or len(snapshot) != 6 or not snapshot[:4].isdigit() or snapshot[4:] not in ['H1', 'H2']:
+        if not snapshot or not _SNAPSHOT_RE.fullmatch(snapshot):
             raise HTTPException(status_code=400, detail="Snapshot must be in format YYYYH1 or YYYYH2 (e.g., 2024H1)")
 
-        # Create temporary file to save uploaded content
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
+        # Open the spooled upload in place; only sheet names are read at this point
+        try:
+            await file.seek(0)
+            workbook = await _run_blocking(pd.ExcelFile, file.file)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid Excel file format: {str(e)}")
+
+        try:
+            # Find the scores sheet (case insensitive); other sheets are never parsed
+            scores_sheet_name = next((name for name in workbook.sheet_names if 'score' in name.lower()), None)
+            if scores_sheet_name is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Excel file must contain a 'Scores' sheet with metric data"
+                )
+
             try:
-                # Read and save uploaded file
-                content = await file.read()
-                temp_file.write(content)
-                temp_file.flush()
-
-                # Validate Excel file structure
-                try:
-                    excel_data = pd.read_excel(temp_file.name, sheet_name=None)
-                except Exception as e:
-                    raise HTTPException(status_code=400, detail=f"Invalid Excel file format: {str(e)}")
-
-                # Check for required sheets (case insensitive)
-                sheet_names = [name.lower() for name in excel_data.keys()]
-                required_sheets = ['scores']  # At minimum, we need scores sheet
-
-                if not any('score' in sheet_name for sheet_name in sheet_names):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Excel file must contain a 'Scores' sheet with metric data"
-                    )
-
-                # Find the scores sheet
-                scores_sheet_name = None
-                for original_name, lower_name in zip(excel_data.keys(), sheet_names):
-                    if 'score' in lower_name:
-                        scores_sheet_name = original_name
-                        break
-
-                if not scores_sheet_name:
-                    raise HTTPException(status_code=400, detail="Could not find Scores sheet in Excel file")
-
-                scores_df = excel_data[scores_sheet_name]
-
-                # Validate scores sheet structure
-                if scores_df.empty:
-                    raise HTTPException(status_code=400, detail="Scores sheet is empty")
-
-                # Check if data manager supports snapshot operations
-                if not hasattr(data_manager, 'replace_snapshot_data'):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Current data source does not support snapshot data replacement"
-                    )
-
-                # Replace data for the specified snapshot
-                data_manager.replace_snapshot_data(scores_df, snapshot)
-
-                # Save the updated data
-                data_manager.save_data()
-
-                # Get updated rankings for the snapshot
-                if hasattr(ranking_engine, 'calculate_rankings') and 'snapshot' in ranking_engine.calculate_rankings.__code__.co_varnames:
-                    updated_rankings = ranking_engine.calculate_rankings(snapshot=snapshot)
-                else:
-                    updated_rankings = ranking_engine.calculate_rankings()
-
-                return {
-                    "ok": True,
-                    "message": f"Excel data successfully uploaded and applied to snapshot {snapshot}",
-                    "snapshot": snapshot,
-                    "records_processed": len(scores_df),
-                    "updated_at": "now"
-                }
-
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file.name)
-                except OSError:
-                    pass  # Ignore cleanup errors
+                scores_df = await _run_blocking(workbook.parse, scores_sheet_name)
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Invalid Excel file format: {str(e)}")
+        finally:
+            workbook.close()
+
+        # Validate scores sheet structure
+        if scores_df.empty:
+            raise HTTPException(status_code=400, detail="Scores sheet is empty")
+
+        # Check if data manager supports snapshot operations
+        if not _supports(data_manager, 'replace_snapshot_data'):
+            raise HTTPException(
+                status_code=400,
+                detail="Current data source does not support snapshot data replacement"
+            )
+
+        # Replace data for the specified snapshot
+        await _run_blocking(data_manager.replace_snapshot_data, scores_df, snapshot)
+
+        # Save the updated data
+        await _run_blocking(data_manager.save_data)
+
+        return {
+            "ok": True,
+            "message": f"Excel data successfully uploaded and applied to snapshot {snapshot}",
+            "snapshot": snapshot,
+            "records_processed": len(scores_df),
+            "updated_at": "now"
+        }
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error uploading Excel data: {e}")
+        logger.error("Error uploading Excel data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to upload Excel data: {str(e)}")
 
 
 @router.post("/update/expected-rankings")
 async def update_expected_rankings(
     request: BulkExpectedRankingUpdate,
-    data_manager: DataManager = Depends(get_data_manager),
-    ranking_engine: RankingEngine = Depends(get_ranking_engine)
+    data_manager: DataManager = Depends(get_data_manager)
 ) -> Dict[str, Any]:
     """Update expected rankings for multiple members."""
     try:
-        # Get all members to validate aliases and get roles
-        all_members = data_manager.get_members()
-        member_lookup = {member.alias: member.role for member in all_members}
-
-        # Validate aliases and convert request to list of dictionaries
-        rankings_data = []
-        for ranking in request.rankings:
-            if ranking.alias not in member_lookup:
-                raise ValueError(f"Invalid alias: {ranking.alias}. Alias not found in members table.")
-
-            rankings_data.append({
-                "alias": ranking.alias,
-                "role": member_lookup[ranking.alias],  # Get role from members table
-                "rank": ranking.rank
-            })
+        # Validate aliases and get roles from the members table
+        member_lookup = data_manager.get_alias_role_map()
+        unknown = next((r.alias for r in request.rankings if r.alias not in member_lookup), None)
+        if unknown is not None:
+            raise ValueError(f"Invalid alias: {unknown}. Alias not found in members table.")
+
+        # Convert request to list of dictionaries
+        rankings_data = [
+            {"alias": r.alias, "role": member_lookup[r.alias], "rank": r.rank}
+            for r in request.rankings
+        ]
 
         # Update expected rankings
-        data_manager.update_expected_rankings(rankings_data)
+        await _run_blocking(data_manager.update_expected_rankings, rankings_data)
 
         # Save data
-        data_manager.save_data()
-
-        # Get updated rankings
-        updated_rankings = ranking_engine.calculate_rankings()
+        await _run_blocking(data_manager.save_data)
 
         return {
             "ok": True,
@@ -529,18 +709,17 @@ async def update_expected_rankings(
         }
 
     except (ValueError, DataValidationError, SQLiteDataValidationError) as e:
-        logger.warning(f"Invalid expected rankings update request: {e}")
+        logger.warning("Invalid expected rankings update request: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error updating expected rankings: {e}")
+        logger.error("Error updating expected rankings: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update expected rankings")
 
 
 @router.post("/update/roles")
 async def update_roles(
     request: BulkRoleUpdate,
-    data_manager: DataManager = Depends(get_data_manager),
-    ranking_engine: RankingEngine = Depends(get_ranking_engine)
+    data_manager: DataManager = Depends(get_data_manager)
 ) -> Dict[str, Any]:
     """Update roles for multiple members."""
     try:
@@ -554,13 +733,10 @@ async def update_roles(
         ]
 
         # Update roles
-        data_manager.update_roles(roles_data)
+        await _run_blocking(data_manager.update_roles, roles_data)
 
         # Save data
-        data_manager.save_data()
-
-        # Get updated rankings
-        updated_rankings = ranking_engine.calculate_rankings()
+        await _run_blocking(data_manager.save_data)
 
         return {
             "ok": True,
@@ -570,10 +746,10 @@ async def update_roles(
         }
 
     except (ValueError, DataValidationError, SQLiteDataValidationError) as e:
-        logger.warning(f"Invalid roles update request: {e}")
+        logger.warning("Invalid roles update request: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error updating roles: {e}")
+        logger.error("Error updating roles: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update roles")
 
 
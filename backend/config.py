@@ -13,11 +13,14 @@ class Settings:
     DATA_SOURCE: str = os.getenv("DATA_SOURCE", "excel")  # "excel" or "sqlite"
     EXCEL_PATH: str = os.getenv("EXCEL_PATH", "rank.xlsx")
     SQLITE_PATH: str = os.getenv("SQLITE_PATH", "ranking.db")
+    DATA_CACHE_DIR: str = os.getenv("DATA_CACHE_DIR", ".cache/datamgr")  # empty disables the parsed-sheet cache
 
     # Server configuration
     PORT: int = int(os.getenv("PORT", "8000"))
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     CORS_ORIGINS: List[str] = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))  # bytes
+    GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "5"))
 
     # Data validation settings
     MAX_MEMBERS: int = 500
@@ -26,7 +29,6 @@ class Settings:
 
     # Algorithm settings
     DEFAULT_TARGET_PERCENT: float = 0.05  # 5%
-    MAX_ADJUSTMENT_ITERATIONS: int = 3
     TARGET_ACHIEVEMENT_TOLERANCE: float = 0.005  # 0.5%
 
 settings = Settings()
@@ -1,16 +1,40 @@
 """Data management for Excel/CSV files and core data operations."""
 
+import hashlib
 import logging
 import os
+import numpy as np
+import orjson
 import pandas as pd
-import threading
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 import fcntl
 from contextlib import contextmanager
 
 from backend.models import Member, Metric, RankingEntry
 from backend.config import settings
+from backend.rwlock import ReadWriteLock
+
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READER_ENGINE: Optional[str] = 'calamine'
+except ImportError:  # python-calamine is optional; pandas falls back to openpyxl
+    EXCEL_READER_ENGINE = None
+
+try:
+    import xlsxwriter  # noqa: F401
+    EXCEL_WRITER_ENGINE = 'xlsxwriter'
+except ImportError:  # xlsxwriter is optional; openpyxl writes the same values, just slower
+    EXCEL_WRITER_ENGINE = 'openpyxl'
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:  # pyarrow is optional; without it names stay object-dtype strings
+    PYARROW_AVAILABLE = False
+
+STRING_DTYPE: Optional[str] = 'string[pyarrow]' if PYARROW_AVAILABLE else None
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +44,69 @@ class DataValidationError(Exception):
     pass
 
 
+def _frame_to_json(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Describe a parsed sheet as plain JSON data, or None if it would not load back identically.
+
+    Numeric, boolean and datetime columns are kept as arrays with their dtype;
+    object columns may only hold strings, numbers and blanks.
+    """
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        return None
+
+    columns = []
+    for name, column in df.items():
+        if not isinstance(name, (str, int)) or not isinstance(column.dtype, np.dtype):
+            return None
+        if column.dtype.kind in 'biuf':
+            values: Any = column.to_numpy()
+        elif column.dtype.kind == 'M':
+            values = column.to_numpy().view('i8')
+        elif column.dtype.kind == 'O':
+            values = [None if isinstance(v, float) and np.isnan(v) else v for v in column.tolist()]
+            if not all(v is None or isinstance(v, (str, int, float)) for v in values):
+                return None
+        else:
+            return None
+        columns.append({'name': name, 'dtype': column.dtype.str, 'values': values})
+
+    sheet = {'columns': columns}
+    try:
+        # Float formatting and NaN/None blanks must come back exactly as parsed
+        loaded = _frame_from_json(orjson.loads(orjson.dumps(sheet, option=orjson.OPT_SERIALIZE_NUMPY)))
+    except (TypeError, ValueError, orjson.JSONEncodeError):
+        return None
+    if not loaded.equals(df) or not loaded.dtypes.equals(df.dtypes):
+        return None
+    return sheet
+
+
+def _frame_from_json(sheet: Dict[str, Any]) -> pd.DataFrame:
+    """Rebuild a parsed sheet stored by _frame_to_json."""
+    data = {}
+    for column in sheet['columns']:
+        dtype = np.dtype(column['dtype'])
+        values = column['values']
+        if dtype.kind == 'M':
+            data[column['name']] = np.array(values, dtype='i8').view(dtype)
+        elif dtype.kind == 'O':
+            data[column['name']] = pd.Series([np.nan if v is None else v for v in values], dtype=object)
+        else:
+            data[column['name']] = np.array(values, dtype=dtype)
+    return pd.DataFrame(data)
+
+
 class DataManager:
     """Manages data loading, validation, and persistence for the ranking system."""
+
+    # Sheets that can be reloaded independently of each other
+    SHEET_KINDS = frozenset({'roles', 'scores', 'expected'})
+
+    # CSV fallback file for each sheet kind
+    CSV_FILES = {
+        'roles': 'Roles.csv',
+        'scores': 'Scores.csv',
+        'expected': 'ExpectedRanking.csv'
+    }
     
     def __init__(self, excel_path: str):
         self.excel_path = Path(excel_path)
@@ -31,40 +116,149 @@ class DataManager:
         self._data_loaded = False
         self._last_modified = None
 
-        # Thread safety for concurrent data operations
-        self._data_lock = threading.RLock()
+        # File each sheet kind was read from and the mtimes seen when reading them
+        self._sheet_sources: Dict[str, Path] = {}
+        self._file_mtimes: Dict[str, float] = {}
+
+        # Bumped on every mutation so derived lookups can be cached per version
+        self._data_version = 0
+        self._lookup_version = -1
+        self._members_by_alias: Dict[str, Member] = {}
+        self._roles_by_alias: Dict[str, str] = {}
+        self._scores_by_alias: Dict[str, Dict[str, float]] = {}
+        self._view_cache: Dict[str, Tuple[int, Any]] = {}
+
+        # Thread safety for concurrent data operations: getters share the lock,
+        # anything that replaces or mutates the frames takes it exclusively
+        self._data_lock = ReadWriteLock()
         self._file_watcher = None
+
+        # Descriptor of the data file kept open for write locks (opened on first save)
+        self._lock_fd: Optional[int] = None
     
     def load_data(self) -> None:
         """Load data from Excel file or CSV fallbacks."""
-        with self._data_lock:
+        kinds = set(self.SHEET_KINDS)
+        with self._data_lock.write_locked():
             try:
-                if self.excel_path.exists() and self.excel_path.suffix == '.xlsx':
-                    self._load_from_excel()
-                else:
-                    self._load_from_csv()
+                self._read_sheets(kinds)
 
-                self._validate_data()
-                self._normalize_data()
+                self._validate_data(kinds)
+                self._normalize_data(kinds)
                 self._data_loaded = True
+                self._data_version += 1
                 self._last_modified = self.excel_path.stat().st_mtime if self.excel_path.exists() else None
                 logger.info("Data loaded and validated successfully")
 
             except Exception as e:
                 logger.error(f"Failed to load data: {e}")
                 raise DataValidationError(f"Data loading failed: {e}")
-    
-    def _load_from_excel(self) -> None:
+
+    def reload_changed(self) -> Set[str]:
+        """Re-read only the sheets whose source file changed since it was read.
+
+        Returns the sheet kinds that were reloaded.
+        """
+        with self._data_lock.write_locked():
+            if not self._data_loaded:
+                self.load_data()
+                return set(self.SHEET_KINDS)
+
+            # An Excel change reloads every sheet from one workbook open
+            if self.is_data_modified():
+                changed = set(self.SHEET_KINDS)
+            else:
+                changed = {kind for kind in self.SHEET_KINDS if self._source_changed(kind)}
+            if not changed:
+                return changed
+
+            try:
+                self._read_sheets(changed)
+                self._validate_data(changed)
+                self._normalize_data(changed)
+            except Exception as e:
+                logger.error(f"Failed to reload {', '.join(sorted(changed))} data: {e}")
+                raise DataValidationError(f"Data loading failed: {e}")
+
+            self._data_version += 1
+            self._last_modified = self.excel_path.stat().st_mtime if self.excel_path.exists() else None
+            logger.info(f"Reloaded changed data: {', '.join(sorted(changed))}")
+            return changed
+
+    def has_file_changes(self) -> bool:
+        """Check whether any file behind the sheets changed since it was read or saved."""
+        with self._data_lock.read_locked():
+            return self.is_data_modified() or any(self._source_changed(kind) for kind in self.SHEET_KINDS)
+
+    def _source_changed(self, kind: str) -> bool:
+        """Check whether the file a sheet kind was read from changed on disk."""
+        path = self._sheet_sources.get(kind)
+        if path is None:
+            # Nothing was read for this sheet; it changed if its CSV has appeared
+            return Path(self.CSV_FILES[kind]).exists()
+
+        try:
+            return path.stat().st_mtime != self._file_mtimes.get(str(path))
+        except OSError:
+            return True
+
+    def _record_source(self, kind: str, path: Path, mtime: float) -> None:
+        """Remember the file a sheet kind was read from or saved to."""
+        self._sheet_sources[kind] = path
+        self._file_mtimes[str(path)] = mtime
+
+    def _read_sheets(self, kinds: Set[str]) -> None:
+        """Read the given sheet kinds from the Excel file or CSV fallbacks."""
+        if self.excel_path.exists() and self.excel_path.suffix == '.xlsx':
+            self._load_from_excel(kinds)
+        else:
+            self._load_from_csv(kinds)
+
+    def _load_from_excel(self, kinds: Set[str]) -> None:
         """Load data from Excel file."""
         logger.info(f"Loading data from Excel file: {self.excel_path}")
         
         try:
-            # Read all sheets
-            excel_data = pd.read_excel(self.excel_path, sheet_name=None)
-            
+            mtime = self.excel_path.stat().st_mtime
+
+            # Sheets parsed from this exact workbook before, e.g. by a previous process
+            digest = self._workbook_digest()
+            excel_data: Dict[str, pd.DataFrame] = {}
+            uncached = set()
+            for kind in kinds:
+                cached = self._read_parsed_sheet(digest, kind)
+                if cached is None:
+                    uncached.add(kind)
+                else:
+                    excel_data.update(cached)
+
+            if uncached:
+                excel_data.update(self._parse_workbook(uncached))
+                for kind in uncached:
+                    self._write_parsed_sheet(digest, kind, excel_data)
+
+            # Load dataframes
+            if 'roles' in excel_data:
+                self.roles_df = excel_data['roles']
+            if 'scores' in excel_data:
+                self.scores_df = excel_data['scores']
+            if 'expected' in excel_data:
+                self.expected_ranking_df = excel_data['expected']
+
+            for kind in kinds:
+                self._record_source(kind, self.excel_path, mtime)
+
+        except Exception as e:
+            logger.warning(f"Failed to load from Excel: {e}. Trying CSV fallback.")
+            self._load_from_csv(kinds)
+
+    def _parse_workbook(self, kinds: Set[str]) -> Dict[str, pd.DataFrame]:
+        """Parse the given sheet kinds from the Excel file, keyed by kind."""
+        # Open the workbook once; only sheet names are read at this point
+        with self._open_workbook() as workbook:
             # Map sheet names (case insensitive)
             sheet_mapping = {}
-            for sheet_name in excel_data.keys():
+            for sheet_name in workbook.sheet_names:
                 lower_name = sheet_name.lower()
                 if 'role' in lower_name:
                     sheet_mapping['roles'] = sheet_name
@@ -72,113 +266,279 @@ class DataManager:
                     sheet_mapping['scores'] = sheet_name
                 elif 'expected' in lower_name or 'ranking' in lower_name:
                     sheet_mapping['expected'] = sheet_name
-            
-            # Load dataframes
-            if 'roles' in sheet_mapping:
-                self.roles_df = excel_data[sheet_mapping['roles']]
-            if 'scores' in sheet_mapping:
-                self.scores_df = excel_data[sheet_mapping['scores']]
-            if 'expected' in sheet_mapping:
-                self.expected_ranking_df = excel_data[sheet_mapping['expected']]
-                
+
+            # Parse only the mapped sheets that were asked for
+            return {key: self._load_sheet(workbook, name)
+                    for key, name in sheet_mapping.items() if key in kinds}
+
+    def _open_workbook(self) -> pd.ExcelFile:
+        """Open the Excel file with the Rust-backed calamine reader when it is usable."""
+        if EXCEL_READER_ENGINE is not None:
+            try:
+                return pd.ExcelFile(self.excel_path, engine=EXCEL_READER_ENGINE)
+            except ValueError as e:
+                # pandas before 2.2 does not know the calamine engine
+                logger.debug(f"Excel engine {EXCEL_READER_ENGINE} unavailable: {e}")
+        return pd.ExcelFile(self.excel_path)
+
+    def _workbook_digest(self) -> str:
+        """SHA-256 of the Excel file contents, used to key the parsed-sheet cache."""
+        with open(self.excel_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _parsed_sheet_path(self, digest: str, kind: str) -> Optional[Path]:
+        """Cache file for one parsed sheet of one workbook version, if caching is enabled."""
+        if not settings.DATA_CACHE_DIR:
+            return None
+        return Path(settings.DATA_CACHE_DIR) / f"{self._parsed_sheet_prefix()}-{digest}-{kind}.json"
+
+    def _parsed_sheet_prefix(self) -> str:
+        """Cache file prefix unique to this workbook's location, so same-named workbooks stay apart."""
+        location = hashlib.sha256(str(self.excel_path.resolve()).encode()).hexdigest()[:16]
+        return f"{self.excel_path.stem}-{location}"
+
+    def _read_parsed_sheet(self, digest: str, kind: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Return the cached parse of a sheet ({} if the workbook lacks it), or None on a miss."""
+        path = self._parsed_sheet_path(digest, kind)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                sheet = orjson.loads(f.read())['sheet']
+            return {} if sheet is None else {kind: _frame_from_json(sheet)}
         except Exception as e:
-            logger.warning(f"Failed to load from Excel: {e}. Trying CSV fallback.")
-            self._load_from_csv()
+            logger.debug(f"Ignoring unreadable sheet cache {path}: {e}")
+            return None
+
+    def _write_parsed_sheet(self, digest: str, kind: str, excel_data: Dict[str, pd.DataFrame]) -> None:
+        """Store a freshly parsed sheet and drop its entries for older workbook versions."""
+        path = self._parsed_sheet_path(digest, kind)
+        if path is None:
+            return
+
+        sheet = None
+        if kind in excel_data:
+            sheet = _frame_to_json(excel_data[kind])
+            if sheet is None:
+                logger.debug(f"Not caching {kind} sheet: it does not round-trip through JSON")
+                return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps({'sheet': sheet}, option=orjson.OPT_SERIALIZE_NUMPY))
+            os.replace(tmp_path, path)
+
+            for stale in path.parent.glob(f"{self._parsed_sheet_prefix()}-*-{kind}.json"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not write sheet cache {path}: {e}")
+
+    @staticmethod
+    def _load_sheet(workbook: pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+        """Parse a single sheet of an open workbook."""
+        return workbook.parse(sheet_name)
     
-    def _load_from_csv(self) -> None:
+    def _load_from_csv(self, kinds: Set[str]) -> None:
         """Load data from CSV files."""
         logger.info("Loading data from CSV files")
         
-        csv_files = {
-            'roles': 'Roles.csv',
-            'scores': 'Scores.csv', 
-            'expected': 'ExpectedRanking.csv'
-        }
-        
-        for key, filename in csv_files.items():
+        for key, filename in self.CSV_FILES.items():
+            if key not in kinds:
+                continue
             filepath = Path(filename)
             if filepath.exists():
-                df = pd.read_csv(filepath)
+                mtime = filepath.stat().st_mtime
+                df = self._read_csv(filepath)
                 setattr(self, f"{key}_df", df)
+                self._record_source(key, filepath, mtime)
                 logger.info(f"Loaded {filename}")
             else:
+                self._sheet_sources.pop(key, None)
                 logger.warning(f"CSV file not found: {filename}")
     
-    def _validate_data(self) -> None:
-        """Validate loaded data structure and content."""
+    @staticmethod
+    def _read_csv(filepath: Path) -> pd.DataFrame:
+        """Read a CSV file, with pyarrow's multi-threaded parser when it is installed."""
+        if PYARROW_AVAILABLE:
+            try:
+                # NumPy-backed columns keep the score arithmetic unchanged
+                return pd.read_csv(filepath, engine='pyarrow')
+            except (ImportError, ValueError) as e:
+                logger.debug(f"pyarrow CSV parser failed for {filepath}: {e}")
+        return pd.read_csv(filepath)
+    
+    def _validate_data(self, kinds: Optional[Set[str]] = None) -> None:
+        """Validate loaded data structure and content (of the given sheet kinds)."""
+        kinds = self.SHEET_KINDS if kinds is None else kinds
         errors = []
         
         # Check if required dataframes are loaded
-        if self.roles_df is None:
+        if 'roles' in kinds and self.roles_df is None:
             errors.append("Roles data not found")
-        if self.scores_df is None:
+        if 'scores' in kinds and self.scores_df is None:
             errors.append("Scores data not found")
-        if self.expected_ranking_df is None:
+        if 'expected' in kinds and self.expected_ranking_df is None:
             logger.warning("Expected ranking data not found - will proceed without it")
         
         if errors:
             raise DataValidationError(f"Missing required data: {', '.join(errors)}")
         
-        # Validate Roles sheet
-        required_roles_cols = ['alias', 'role']
-        if not all(col in self.roles_df.columns for col in required_roles_cols):
-            errors.append(f"Roles sheet missing required columns: {required_roles_cols}")
-        
-        # Validate Scores sheet structure
-        if 'metrics' not in self.scores_df.columns:
-            errors.append("Scores sheet missing 'metrics' column")
+        if 'roles' in kinds:
+            # Validate Roles sheet
+            required_roles_cols = ['alias', 'role']
+            if not all(col in self.roles_df.columns for col in required_roles_cols):
+                errors.append(f"Roles sheet missing required columns: {required_roles_cols}")
+
+            # Check for reasonable data sizes
+            if len(self.roles_df) > settings.MAX_MEMBERS:
+                errors.append(f"Too many members: {len(self.roles_df)} > {settings.MAX_MEMBERS}")
         
-        # Check for reasonable data sizes
-        if len(self.roles_df) > settings.MAX_MEMBERS:
-            errors.append(f"Too many members: {len(self.roles_df)} > {settings.MAX_MEMBERS}")
-        
-        if len(self.scores_df) > settings.MAX_METRICS:
-            errors.append(f"Too many metrics: {len(self.scores_df)} > {settings.MAX_METRICS}")
+        if 'scores' in kinds:
+            # Validate Scores sheet structure
+            if 'metrics' not in self.scores_df.columns:
+                errors.append("Scores sheet missing 'metrics' column")
+
+            if len(self.scores_df) > settings.MAX_METRICS:
+                errors.append(f"Too many metrics: {len(self.scores_df)} > {settings.MAX_METRICS}")
         
         if errors:
             raise DataValidationError(f"Data validation failed: {', '.join(errors)}")
     
-    def _normalize_data(self) -> None:
-        """Normalize and clean data."""
+    def _normalize_data(self, kinds: Optional[Set[str]] = None) -> None:
+        """Normalize and clean data (of the given sheet kinds)."""
+        kinds = self.SHEET_KINDS if kinds is None else kinds
+
         # Normalize alias and role names (trim whitespace, consistent casing)
-        if self.roles_df is not None:
-            self.roles_df['alias'] = self.roles_df['alias'].astype(str).str.strip()
-            self.roles_df['role'] = self.roles_df['role'].astype(str).str.strip()
-            # Remove empty rows
+        if 'roles' in kinds and self.roles_df is not None:
+            # Remove empty rows (before the string cast would turn them into 'nan')
             self.roles_df = self.roles_df.dropna(subset=['alias', 'role'])
+            self.roles_df['alias'] = self._strip_strings(self.roles_df['alias'])
+            self.roles_df['role'] = self._strip_strings(self.roles_df['role'])
             self.roles_df = self.roles_df[self.roles_df['alias'] != '']
         
-        if self.scores_df is not None:
-            self.scores_df['metrics'] = self.scores_df['metrics'].astype(str).str.strip()
+        if 'scores' in kinds and self.scores_df is not None:
             # Remove empty rows
             self.scores_df = self.scores_df.dropna(subset=['metrics'])
+            self.scores_df['metrics'] = self._strip_strings(self.scores_df['metrics'])
             self.scores_df = self.scores_df[self.scores_df['metrics'] != '']
         
-        if self.expected_ranking_df is not None:
-            self.expected_ranking_df['alias'] = self.expected_ranking_df['alias'].astype(str).str.strip()
+        if 'expected' in kinds and self.expected_ranking_df is not None:
             # Remove empty rows
             self.expected_ranking_df = self.expected_ranking_df.dropna(subset=['alias'])
+            self.expected_ranking_df['alias'] = self._strip_strings(self.expected_ranking_df['alias'])
             self.expected_ranking_df = self.expected_ranking_df[self.expected_ranking_df['alias'] != '']
+
+    @staticmethod
+    def _strip_strings(column: pd.Series) -> pd.Series:
+        """Cast a column to whitespace-trimmed strings, Arrow-backed when pyarrow is installed."""
+        if STRING_DTYPE is None:
+            return column.astype(str).str.strip()
+        return column.astype(STRING_DTYPE).str.strip()
     
     @contextmanager
     def _file_lock(self):
         """Context manager for file locking during writes."""
-        if not self.excel_path.exists():
+        try:
+            lock_fd = self._get_lock_fd()
+        except FileNotFoundError:
             yield
             return
-            
-        with open(self.excel_path, 'r+b') as f:
+
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            yield
+        except IOError:
+            raise DataValidationError("File is locked by another process")
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+
+    def _get_lock_fd(self) -> int:
+        """Return the cached lock descriptor, reopening it if the file was replaced."""
+        file_stat = os.stat(self.excel_path)
+        if self._lock_fd is not None:
+            if os.path.samestat(os.fstat(self._lock_fd), file_stat):
+                return self._lock_fd
+            # Editors often save by renaming a new file over the old one
+            self._close_lock_fd()
+
+        self._lock_fd = os.open(self.excel_path, os.O_RDWR)
+        return self._lock_fd
+
+    def _close_lock_fd(self) -> None:
+        """Close the cached lock descriptor if one is open."""
+        if self._lock_fd is not None:
             try:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                yield
-            except IOError:
-                raise DataValidationError("File is locked by another process")
+                os.close(self._lock_fd)
             finally:
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                self._lock_fd = None
+
+    def close(self) -> None:
+        """Release the file descriptor held for write locks."""
+        with self._data_lock.write_locked():
+            self._close_lock_fd()
+
+    def __del__(self):
+        try:
+            self._close_lock_fd()
+        except Exception:
+            pass
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the loaded data is mutated."""
+        return self._data_version
+
+    def _refresh_lookups_unsafe(self) -> None:
+        """Rebuild the alias lookup tables if the data changed (caller holds the lock)."""
+        if self._lookup_version == self._data_version:
+            return
+
+        self._members_by_alias = {m.alias: m for m in self._get_members_unsafe()}
+        self._roles_by_alias = {alias: m.role for alias, m in self._members_by_alias.items()}
+        self._scores_by_alias = self._cached_view('member_scores', self._build_member_scores_unsafe)
+        self._lookup_version = self._data_version
+
+    def _cached_view(self, name: str, build: Callable[[], Any]) -> Any:
+        """Memoise a derived view for the current data version (caller holds the lock)."""
+        version, value = self._view_cache.get(name, (-1, None))
+        if version != self._data_version:
+            value = build()
+            self._view_cache[name] = (self._data_version, value)
+        return value
+
+    def get_member_by_alias(self, alias: str) -> Optional[Member]:
+        """Get a single team member by alias."""
+        with self._data_lock.read_locked():
+            if not self._data_loaded:
+                raise DataValidationError("Data not loaded")
+
+            self._refresh_lookups_unsafe()
+            return self._members_by_alias.get(alias)
+
+    def get_alias_role_map(self) -> Dict[str, str]:
+        """Get the role of every member keyed by alias."""
+        with self._data_lock.read_locked():
+            if not self._data_loaded:
+                raise DataValidationError("Data not loaded")
+
+            self._refresh_lookups_unsafe()
+            return dict(self._roles_by_alias)
+
+    def get_scores_for(self, alias: str) -> Dict[str, float]:
+        """Get the scores of a single member for all metrics."""
+        with self._data_lock.read_locked():
+            if not self._data_loaded:
+                raise DataValidationError("Data not loaded")
+
+            self._refresh_lookups_unsafe()
+            return dict(self._scores_by_alias.get(alias, {}))
     
     def get_members(self) -> List[Member]:
         """Get all team members."""
-        with self._data_lock:
+        with self._data_lock.read_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -186,14 +546,18 @@ class DataManager:
 
     def _get_members_unsafe(self) -> List[Member]:
         """Get all team members without locking (for internal use)."""
-        members = []
-        for _, row in self.roles_df.iterrows():
-            members.append(Member(alias=row['alias'], role=row['role']))
-        return members
+        return list(self._cached_view('members', self._build_members_unsafe))
+
+    def _build_members_unsafe(self) -> List[Member]:
+        """Build the member list from roles_df (caller holds the lock)."""
+        # Zip the columns directly; iterrows() would box every row into a Series
+        aliases = self.roles_df['alias'].tolist()
+        roles = self.roles_df['role'].tolist()
+        return [Member(alias=alias, role=role) for alias, role in zip(aliases, roles)]
     
     def get_roles(self) -> List[str]:
         """Get all unique roles."""
-        with self._data_lock:
+        with self._data_lock.read_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -201,15 +565,15 @@ class DataManager:
 
     def _get_roles_unsafe(self) -> List[str]:
         """Get all unique roles without locking (for internal use)."""
-        return sorted(self.roles_df['role'].unique().tolist())
+        return list(self._cached_view('roles', lambda: sorted(self.roles_df['role'].unique().tolist())))
     
     def get_role_counts(self) -> Dict[str, int]:
         """Get count of members by role."""
-        with self._data_lock:
+        with self._data_lock.read_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
-            return self.roles_df['role'].value_counts().to_dict()
+            return dict(self._cached_view('role_counts', lambda: self.roles_df['role'].value_counts().to_dict()))
     
     def is_data_modified(self) -> bool:
         """Check if the data file has been modified externally."""
@@ -221,127 +585,144 @@ class DataManager:
 
     def get_metrics(self) -> List[Metric]:
         """Get all metrics with their role weights and bounds."""
-        with self._data_lock:
+        with self._data_lock.read_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
-            metrics = []
-            roles = self._get_roles_unsafe()  # Already inside lock
-
-            for _, row in self.scores_df.iterrows():
-                metric_name = row['metrics']
+            return list(self._cached_view('metrics', self._build_metrics_unsafe))
+
+    def _build_metrics_unsafe(self) -> List[Metric]:
+        """Build the metric list from scores_df (caller holds the lock)."""
+        roles = self._get_roles_unsafe()  # Already inside lock
+        df = self.scores_df
+
+        # Role weights as one float block; roles without a column weigh 0.0
+        weight_rows = df.reindex(columns=roles, fill_value=0.0).to_numpy(dtype=float).tolist()
+
+        # Get min/max values
+        count = len(df)
+        min_vals = df['Min'].to_numpy(dtype=float).tolist() if 'Min' in df.columns else [0.0] * count
+        max_vals = df['Max'].to_numpy(dtype=float).tolist() if 'Max' in df.columns else [1.0] * count
+
+        return [
+            Metric(
+                id=f"M{i + 1}",  # Create metric ID (M1, M2, etc.)
+                name=metric_name,
+                weights_by_role=dict(zip(roles, weights)),
+                min_value=min_val,
+                max_value=max_val
+            )
+            for i, (metric_name, weights, min_val, max_val)
+            in enumerate(zip(df['metrics'].tolist(), weight_rows, min_vals, max_vals))
+        ]
 
-                # Extract role weights
-                weights_by_role = {}
-                for role in roles:
-                    if role in row:
-                        weights_by_role[role] = float(row[role])
-                    else:
-                        weights_by_role[role] = 0.0
+    def get_member_scores(self) -> Dict[str, Dict[str, float]]:
+        """Get all member scores for all metrics."""
+        with self._data_lock.read_locked():
+            if not self._data_loaded:
+                raise DataValidationError("Data not loaded")
 
-                # Get min/max values
-                min_val = float(row.get('Min', 0.0))
-                max_val = float(row.get('Max', 1.0))
+            member_scores = self._cached_view('member_scores', self._build_member_scores_unsafe)
+            return {member: dict(scores) for member, scores in member_scores.items()}
 
-                # Create metric ID (M1, M2, etc.)
-                metric_id = f"M{len(metrics) + 1}"
+    def _build_member_scores_unsafe(self) -> Dict[str, Dict[str, float]]:
+        """Build member -> metric -> score from scores_df (caller holds the lock)."""
+        if self.scores_df.empty:
+            return {}
 
-                metrics.append(Metric(
-                    id=metric_id,
-                    name=metric_name,
-                    weights_by_role=weights_by_role,
-                    min_value=min_val,
-                    max_value=max_val
-                ))
+        # Member columns present in the scores sheet, in roster order
+        members = [alias for alias in dict.fromkeys(self.roles_df['alias'].tolist())
+                   if alias in self.scores_df.columns]
+        metric_names = self.scores_df['metrics'].tolist()
 
-            return metrics
+        # Convert the whole member block to floats once, then read it column by column
+        columns = self.scores_df[members].to_numpy(dtype=float).T.tolist()
+        return {member: dict(zip(metric_names, values)) for member, values in zip(members, columns)}
 
-    def get_member_scores(self) -> Dict[str, Dict[str, float]]:
-        """Get all member scores for all metrics."""
-        with self._data_lock:
+    def get_score_frame(self) -> pd.DataFrame:
+        """Get all member scores as a frame of members (rows) by metrics (columns)."""
+        with self._data_lock.read_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
-            member_scores = {}
-            members = [m.alias for m in self._get_members_unsafe()]  # Already inside lock
-
-            for _, row in self.scores_df.iterrows():
-                metric_name = row['metrics']
+            return self._cached_view('score_frame', self._build_score_frame_unsafe).copy()
 
-                for member in members:
-                    if member in row:
-                        if member not in member_scores:
-                            member_scores[member] = {}
-                        member_scores[member][metric_name] = float(row[member])
+    def _build_score_frame_unsafe(self) -> pd.DataFrame:
+        """Transpose the member columns of scores_df into a member x metric frame (caller holds the lock)."""
+        if self.scores_df.empty:
+            return pd.DataFrame(dtype=float)
 
-            return member_scores
+        # Same members as get_member_scores, in roster order
+        members = [alias for alias in dict.fromkeys(self.roles_df['alias'].tolist())
+                   if alias in self.scores_df.columns]
+        frame = pd.DataFrame(self.scores_df[members].to_numpy(dtype=float).T,
+                             index=members, columns=self.scores_df['metrics'].tolist())
+        # A repeated metric name keeps its last row, as in get_member_scores
+        return frame.loc[:, ~frame.columns.duplicated(keep='last')]
 
     def get_expected_rankings(self) -> Dict[str, int]:
         """Get expected rankings for members."""
-        with self._data_lock:
+        with self._data_lock.read_locked():
             if not self._data_loaded or self.expected_ranking_df is None:
                 return {}
 
-            expected = {}
-            for _, row in self.expected_ranking_df.iterrows():
-                alias = row['alias']
-                rank = int(row['rank'])
-                expected[alias] = rank
+            return dict(self._cached_view('expected_rankings', self._build_expected_rankings_unsafe))
 
-            return expected
+    def _build_expected_rankings_unsafe(self) -> Dict[str, int]:
+        """Build alias -> expected rank from expected_ranking_df (caller holds the lock)."""
+        aliases = self.expected_ranking_df['alias'].tolist()
+        ranks = self.expected_ranking_df['rank'].tolist()
+        return {alias: int(rank) for alias, rank in zip(aliases, ranks)}
 
     def update_member_scores(self, member_alias: str, score_changes: Dict[str, float]) -> None:
         """Update scores for a specific member."""
-        with self._data_lock:
+        with self._data_lock.write_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
-            # Update the scores dataframe
-            for metric_name, new_score in score_changes.items():
-                # Find the metric row
-                metric_mask = self.scores_df['metrics'] == metric_name
-                if not metric_mask.any():
+            # Validate every change first so a bad change leaves the data untouched
+            metrics = self.scores_df['metrics']
+            known_metrics = set(metrics.tolist())
+            for metric_name in score_changes:
+                if metric_name not in known_metrics:
                     raise DataValidationError(f"Metric not found: {metric_name}")
 
-                # Update the member's score
                 if member_alias not in self.scores_df.columns:
                     raise DataValidationError(f"Member not found: {member_alias}")
 
-                # Round the score to remove decimal places
-                rounded_score = round(new_score)
-                self.scores_df.loc[metric_mask, member_alias] = rounded_score
+            # Update the member's scores in one assignment, rounded to remove decimal places
+            if score_changes:
+                new_scores = {metric_name: round(new_score) for metric_name, new_score in score_changes.items()}
+                metric_rows = metrics.isin(list(new_scores)).to_numpy()
+                self.scores_df.loc[metric_rows, member_alias] = metrics[metric_rows].map(new_scores).to_numpy()
 
             # Recompute min/max for affected metrics
             self._recompute_min_max(list(score_changes.keys()))
+            self._data_version += 1
 
     def _recompute_min_max(self, metric_names: List[str]) -> None:
         """Recompute min/max values for specified metrics."""
-        members = [m.alias for m in self.get_members()]
-
-        for metric_name in metric_names:
-            metric_mask = self.scores_df['metrics'] == metric_name
-            if not metric_mask.any():
-                continue
+        metric_rows = self.scores_df['metrics'].isin(metric_names).to_numpy()
+        if not metric_rows.any():
+            return
 
-            # Get all member scores for this metric
-            member_scores = []
-            for member in members:
-                if member in self.scores_df.columns:
-                    score = self.scores_df.loc[metric_mask, member].iloc[0]
-                    if pd.notna(score):
-                        member_scores.append(float(score))
+        # All member scores of the affected metrics as one float block
+        members = [alias for alias in dict.fromkeys(self.roles_df['alias'].tolist())
+                   if alias in self.scores_df.columns]
+        values = self.scores_df.loc[metric_rows, members].to_numpy(dtype=float)
 
-            if member_scores:
-                new_min = min(member_scores)
-                new_max = max(member_scores)
+        # Metrics without any scores keep their current bounds
+        scored = ~np.isnan(values).all(axis=1)
+        if not scored.any():
+            return
 
-                # Update min/max in dataframe
-                self.scores_df.loc[metric_mask, 'Min'] = new_min
-                self.scores_df.loc[metric_mask, 'Max'] = new_max
+        rows = self.scores_df.index[metric_rows][scored]
+        self.scores_df.loc[rows, 'Min'] = np.nanmin(values[scored], axis=1)
+        self.scores_df.loc[rows, 'Max'] = np.nanmax(values[scored], axis=1)
 
     def update_expected_rankings(self, rankings: List[Dict[str, Any]]) -> None:
         """Update expected rankings for multiple members."""
-        with self._data_lock:
+        with self._data_lock.write_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -362,11 +743,12 @@ class DataManager:
             # Update the expected ranking dataframe
             self.expected_ranking_df = new_rankings_df.copy()
             self._normalize_data()
+            self._data_version += 1
             logger.info(f"Updated expected rankings for {len(rankings)} members")
 
     def update_roles(self, roles: List[Dict[str, Any]]) -> None:
         """Update roles for multiple members."""
-        with self._data_lock:
+        with self._data_lock.write_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -387,13 +769,14 @@ class DataManager:
             # Update the roles dataframe
             self.roles_df = new_roles_df.copy()
             self._normalize_data()
+            self._data_version += 1
             logger.info(f"Updated roles for {len(roles)} members")
 
 
 
     def save_data(self) -> None:
         """Save data back to Excel file."""
-        with self._data_lock:
+        with self._data_lock.write_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -417,8 +800,12 @@ class DataManager:
                 raise DataValidationError(f"Data saving failed: {e}")
 
     def _save_to_excel(self) -> None:
-        """Save data to Excel file."""
-        with pd.ExcelWriter(self.excel_path, engine='openpyxl') as writer:
+        """Save data to Excel file.
+
+        Only cell values are written, so no styling is carried over from the
+        existing workbook whichever engine is used.
+        """
+        with pd.ExcelWriter(self.excel_path, engine=EXCEL_WRITER_ENGINE) as writer:
             if self.roles_df is not None:
                 self.roles_df.to_excel(writer, sheet_name='Roles', index=False)
             if self.scores_df is not None:
@@ -426,15 +813,36 @@ class DataManager:
             if self.expected_ranking_df is not None:
                 self.expected_ranking_df.to_excel(writer, sheet_name='ExpectedRanking', index=False)
 
+        mtime = self.excel_path.stat().st_mtime
+        for kind in self.SHEET_KINDS:
+            self._record_source(kind, self.excel_path, mtime)
+
     def _save_to_csv(self) -> None:
         """Save data to CSV files."""
         if self.roles_df is not None:
             self.roles_df.to_csv('Roles.csv', index=False)
         if self.scores_df is not None:
-            self.scores_df.to_csv('Scores.csv', index=False)
+            self._write_scores_csv(self.scores_df, Path('Scores.csv'))
         if self.expected_ranking_df is not None:
             self.expected_ranking_df.to_csv('ExpectedRanking.csv', index=False)
 
+        for kind in self.SHEET_KINDS:
+            filepath = Path(self.CSV_FILES[kind])
+            if filepath.exists():
+                self._record_source(kind, filepath, filepath.stat().st_mtime)
+
+    @staticmethod
+    def _write_scores_csv(df: pd.DataFrame, filepath: Path) -> None:
+        """Write the scores frame, with pyarrow's C++ CSV writer when it is installed."""
+        # Roles and expected rankings are small enough that pandas' writer is fine
+        if PYARROW_AVAILABLE:
+            try:
+                pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(filepath))
+                return
+            except pa.ArrowException as e:
+                logger.debug(f"pyarrow CSV writer failed for {filepath}: {e}")
+        df.to_csv(filepath, index=False)
+
     def start_watching(self) -> None:
         """Start watching data files for automatic reloading."""
         if self._file_watcher is not None:
@@ -473,7 +881,7 @@ class DataManager:
         For Excel/CSV data manager, this replaces the entire scores data
         since snapshots are not directly supported in this format.
         """
-        with self._data_lock:
+        with self._data_lock.write_locked():
             if not self._data_loaded:
                 raise DataValidationError("Data not loaded")
 
@@ -501,6 +909,7 @@ class DataManager:
                 # Validate the new data
                 self._validate_data()
                 self._normalize_data()
+                self._data_version += 1
 
                 logger.info(f"Successfully replaced data for snapshot {snapshot} with {len(scores_df)} records")
 
@@ -1,12 +1,13 @@
 """File system watcher for automatic data reloading."""
 
 import logging
+import os
 import threading
 import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Set
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Optional, Set
 
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.events import PatternMatchingEventHandler, FileSystemEvent
 from watchdog.observers import Observer
 
 if TYPE_CHECKING:
@@ -14,24 +15,32 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# CSV fallback files watched in the current directory
+CSV_FILES = frozenset({'Roles.csv', 'Scores.csv', 'ExpectedRanking.csv'})
 
-class DataFileEventHandler(FileSystemEventHandler):
-    """Event handler for data file changes."""
+# Shortest interval between mtime polls backing up the native event backend
+MIN_POLL_SECONDS = 5.0
+
+
+class DataFileEventHandler(PatternMatchingEventHandler):
+    """Event handler for data file changes.
+
+    Events for directories and for files not matching the data file names are
+    dropped by watchdog's dispatch before they reach the watcher.
+    """
     
-    def __init__(self, file_watcher: 'DataFileWatcher'):
-        super().__init__()
+    def __init__(self, file_watcher: 'DataFileWatcher', patterns: Iterable[str]):
+        super().__init__(patterns=list(patterns), ignore_directories=True, case_sensitive=True)
         self.file_watcher = file_watcher
     
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events."""
-        if not event.is_directory:
-            self.file_watcher._on_file_changed(event.src_path)
+        self.file_watcher._on_file_changed(event.src_path)
     
     def on_moved(self, event: FileSystemEvent) -> None:
         """Handle file move events (e.g., Excel temp file operations)."""
-        if not event.is_directory:
-            # Excel often saves by creating temp file and moving it
-            self.file_watcher._on_file_changed(event.dest_path)
+        # Excel often saves by creating temp file and moving it
+        self.file_watcher._on_file_changed(event.dest_path)
 
 
 class DataFileWatcher:
@@ -50,12 +59,23 @@ class DataFileWatcher:
         self.observer: Optional[Observer] = None
         self.event_handler: Optional[DataFileEventHandler] = None
         
-        # Debouncing mechanism
-        self._debounce_timer: Optional[threading.Timer] = None
-        self._debounce_lock = threading.Lock()
+        # Debouncing mechanism: events poke _reload_event and one long-lived
+        # reloader thread waits for them to go quiet before reloading
+        self._reload_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._reload_thread: Optional[threading.Thread] = None
+
+        # Network mounts and some containers drop native events; poll mtimes as well
+        self.poll_seconds = max(MIN_POLL_SECONDS, debounce_seconds * 2)
+        self._poll_thread: Optional[threading.Thread] = None
+
+        # Data file mtimes a reload last failed on; polling skips them until a file moves again
+        self._failed_mtimes: Optional[Dict[str, Optional[float]]] = None
         
-        # Track files being watched
+        # Track files being watched; resolved Excel paths are compared as strings
         self._watched_files: Set[str] = set()
+        self._watched_resolved: FrozenSet[str] = frozenset()
+        self._watched_names: FrozenSet[str] = frozenset()
         
         # Control flags
         self._is_watching = False
@@ -69,21 +89,29 @@ class DataFileWatcher:
         
         try:
             self.observer = Observer()
-            self.event_handler = DataFileEventHandler(self)
             
             # Watch the Excel file if it exists
             excel_path = self.data_manager.excel_path
-            if excel_path.exists():
-                watch_dir = excel_path.parent
+            resolved_excel = excel_path.resolve() if excel_path.exists() else None
+
+            # Events under the resolved directory carry the symlink target's name
+            patterns = {excel_path.name, *CSV_FILES}
+            if resolved_excel is not None:
+                patterns.add(resolved_excel.name)
+            self.event_handler = DataFileEventHandler(self, patterns=sorted(patterns))
+            if resolved_excel is not None:
+                # Watch the resolved directory so event paths match without resolving each one
+                watch_dir = resolved_excel.parent
                 self.observer.schedule(self.event_handler, str(watch_dir), recursive=False)
                 self._watched_files.add(str(excel_path))
+                self._watched_resolved = frozenset({str(resolved_excel)})
+                self._watched_names = frozenset({excel_path.name, resolved_excel.name})
                 logger.info(f"Watching Excel file: {excel_path}")
             
             # Watch CSV files
-            csv_files = ['Roles.csv', 'Scores.csv', 'ExpectedRanking.csv']
             current_dir = Path.cwd()
             
-            for csv_file in csv_files:
+            for csv_file in sorted(CSV_FILES):
                 csv_path = current_dir / csv_file
                 if csv_path.exists():
                     # Only add directory watch if not already watching current directory
@@ -97,6 +125,24 @@ class DataFileWatcher:
                 return
             
             self.observer.start()
+
+            self._reload_event.clear()
+            self._stop_event = threading.Event()
+            self._reload_thread = threading.Thread(
+                target=self._reload_loop,
+                args=(self._stop_event,),
+                name="data-file-reloader",
+                daemon=True
+            )
+            self._reload_thread.start()
+
+            self._poll_thread = threading.Thread(
+                target=self._poll_loop,
+                args=(self._stop_event,),
+                name="data-file-poller",
+                daemon=True
+            )
+            self._poll_thread.start()
             self._is_watching = True
             logger.info("File watcher started successfully")
             
@@ -113,11 +159,14 @@ class DataFileWatcher:
         self._is_stopping = True
         logger.info("Stopping file watcher...")
         
-        # Cancel any pending debounced reload
-        with self._debounce_lock:
-            if self._debounce_timer:
-                self._debounce_timer.cancel()
-                self._debounce_timer = None
+        # Cancel any pending debounced reload and wake the reloader so it exits
+        self._stop_event.set()
+        self._reload_event.set()
+        for thread in (self._reload_thread, self._poll_thread):
+            if thread is not None:
+                thread.join(timeout=5.0)
+        self._reload_thread = None
+        self._poll_thread = None
         
         self._cleanup()
         logger.info("File watcher stopped")
@@ -136,6 +185,9 @@ class DataFileWatcher:
         
         self.event_handler = None
         self._watched_files.clear()
+        self._watched_resolved = frozenset()
+        self._watched_names = frozenset()
+        self._failed_mtimes = None
         self._is_watching = False
         self._is_stopping = False
     
@@ -144,18 +196,19 @@ class DataFileWatcher:
         if self._is_stopping:
             return
         
-        # Check if this is a file we care about
-        file_path_obj = Path(file_path)
-        
-        # Check if it's our Excel file
-        if file_path_obj.resolve() == self.data_manager.excel_path.resolve():
+        # Check if it's our Excel file. Event paths are normally under the resolved
+        # watch dir; only paths with the workbook's name are worth resolving
+        file_name = os.path.basename(file_path)
+        if file_path in self._watched_resolved or (
+            file_name in self._watched_names
+            and str(Path(file_path).resolve()) in self._watched_resolved
+        ):
             logger.debug(f"Excel file changed: {file_path}")
             self._schedule_debounced_reload()
             return
         
         # Check if it's one of our CSV files
-        csv_files = {'Roles.csv', 'Scores.csv', 'ExpectedRanking.csv'}
-        if file_path_obj.name in csv_files:
+        if file_name in CSV_FILES:
             logger.debug(f"CSV file changed: {file_path}")
             self._schedule_debounced_reload()
             return
@@ -165,37 +218,67 @@ class DataFileWatcher:
     
     def _schedule_debounced_reload(self) -> None:
         """Schedule a debounced data reload."""
-        with self._debounce_lock:
-            # Cancel existing timer if any
-            if self._debounce_timer:
-                self._debounce_timer.cancel()
-            
-            # Schedule new reload
-            self._debounce_timer = threading.Timer(
-                self.debounce_seconds, 
-                self._reload_data
-            )
-            self._debounce_timer.start()
-            logger.debug(f"Scheduled data reload in {self.debounce_seconds} seconds")
+        # The reloader restarts its quiet period on every poke
+        self._reload_event.set()
+        logger.debug(f"Scheduled data reload in {self.debounce_seconds} seconds")
+
+    def _reload_loop(self, stop_event: threading.Event) -> None:
+        """Reload once events have been quiet for debounce_seconds."""
+        while not stop_event.is_set():
+            self._reload_event.wait()
+
+            # Keep waiting while new events arrive within the debounce window
+            while not stop_event.is_set():
+                self._reload_event.clear()
+                if not self._reload_event.wait(self.debounce_seconds):
+                    break
+
+            if stop_event.is_set():
+                return
+            self._reload_data()
     
+    def _poll_loop(self, stop_event: threading.Event) -> None:
+        """Schedule a reload when a data file's mtime moved without a native event."""
+        while not stop_event.wait(self.poll_seconds):
+            try:
+                # Files a reload failed on stay "changed"; retry only once they are written again
+                if self.data_manager.has_file_changes() and self._data_file_mtimes() != self._failed_mtimes:
+                    logger.debug("Polling found a changed data file")
+                    self._schedule_debounced_reload()
+            except Exception as e:
+                logger.debug(f"Data file poll failed: {e}")
+
+    def _data_file_mtimes(self) -> Dict[str, Optional[float]]:
+        """Current mtimes of the Excel file and CSV fallbacks (None for missing files)."""
+        paths = [self.data_manager.excel_path, *(Path.cwd() / name for name in sorted(CSV_FILES))]
+        mtimes: Dict[str, Optional[float]] = {}
+        for path in paths:
+            try:
+                mtimes[str(path)] = path.stat().st_mtime
+            except OSError:
+                mtimes[str(path)] = None
+        return mtimes
+
     def _reload_data(self) -> None:
         """Reload data from files."""
         if self._is_stopping:
             return
-        
+
+        mtimes = self._data_file_mtimes()
         try:
-            logger.info("Reloading data due to file changes...")
-            self.data_manager.load_data()
-            logger.info("Data reloaded successfully")
+            # Only sheets whose file mtime moved are re-read; the data manager's
+            # own saves record their mtimes, so their events reload nothing
+            changed = self.data_manager.reload_changed()
+            self._failed_mtimes = None
+            if changed:
+                logger.info("Data reloaded successfully")
+            else:
+                logger.debug("Ignoring file change with no data file modified")
             
         except Exception as e:
             logger.error(f"Failed to reload data: {e}")
             # Don't raise - keep serving old data rather than crashing
-        
-        finally:
-            # Clear the timer reference
-            with self._debounce_lock:
-                self._debounce_timer = None
+            self._failed_mtimes = mtimes
     
     @property
     def is_watching(self) -> bool:
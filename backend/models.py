@@ -1,9 +1,12 @@
 """Data models for the Team Stack Ranking Manager."""
 
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from pydantic import BaseModel, Field
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, UniqueConstraint
+from typing import Dict, List, Mapping, Optional, Any, Tuple
+from dataclasses import dataclass
+import time
+from types import MappingProxyType
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -11,13 +14,29 @@ from sqlalchemy.orm import relationship
 Base = declarative_base()
 
 
+# (monotonic time computed at, snapshot) of the last get_current_snapshot() result
+_SNAPSHOT_CACHE_SECONDS = 60.0
+_snapshot_cache = (float('-inf'), "")
+
+
 def get_current_snapshot() -> str:
-    """Get the current snapshot in YYYYH1 or YYYYH2 format."""
-    now = datetime.now()
-    year = now.year
+    """Get the current snapshot in YYYYH1 or YYYYH2 format, based on the UTC date.
+
+    The result is reused for up to a minute, since it is the column default
+    of every inserted score and is looked up several times per request.
+    """
+    global _snapshot_cache
+    computed_at, snapshot = _snapshot_cache
+    tick = time.monotonic()
+    if tick - computed_at < _SNAPSHOT_CACHE_SECONDS:
+        return snapshot
+
+    now = datetime.now(timezone.utc)
     # H1 is first half (Jan-Jun), H2 is second half (Jul-Dec)
     half = "H1" if now.month <= 6 else "H2"
-    return f"{year}{half}"
+    snapshot = f"{now.year}{half}"
+    _snapshot_cache = (tick, snapshot)
+    return snapshot
 
 
 # SQLAlchemy Models for Database
@@ -78,8 +97,12 @@ class ScoreDB(Base):
     member = relationship("MemberDB", back_populates="scores")
     metric = relationship("MetricDB", back_populates="scores")
 
-    # Constraints
-    __table_args__ = (UniqueConstraint('member_id', 'metric_id', 'snapshot', name='_member_metric_snapshot_score_uc'),)
+    # Constraints and indexes for the per-snapshot and per-member-per-snapshot lookups
+    __table_args__ = (
+        UniqueConstraint('member_id', 'metric_id', 'snapshot', name='_member_metric_snapshot_score_uc'),
+        Index('ix_scores_snapshot_member', 'snapshot', 'member_id'),
+        Index('ix_scores_snapshot_metric', 'snapshot', 'metric_id'),
+    )
 
 
 class ExpectedRankingDB(Base):
@@ -98,14 +121,19 @@ class ExpectedRankingDB(Base):
 
 
 # Pydantic Models (API Models)
+# Models are frozen: cached instances (members, metrics, rankings) are shared between requests
 class Member(BaseModel):
     """Team member model."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     role: str
 
 
 class Metric(BaseModel):
     """Metric model with role weights and bounds."""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     weights_by_role: Dict[str, float]
@@ -115,6 +143,8 @@ class Metric(BaseModel):
 
 class Score(BaseModel):
     """Individual score model."""
+    model_config = ConfigDict(frozen=True)
+
     member_alias: str
     metric_name: str
     score: int  # 0-10 integer score
@@ -123,6 +153,8 @@ class Score(BaseModel):
 
 class RankingEntry(BaseModel):
     """Individual ranking entry."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     role: str
     weighted_score: float
@@ -131,15 +163,38 @@ class RankingEntry(BaseModel):
     mismatch: bool = False
 
 
-class ScoreAdjustmentPreview(BaseModel):
-    """Preview of score adjustments."""
-    proposed: Dict[str, float]
+@dataclass(frozen=True)
+class ScoreAdjustmentPreview:
+    """Preview of score adjustments.
+
+    Built by the adjustment engine on every preview, so it is a slotted dataclass
+    rather than a validated pydantic model. Instances are shared by the preview
+    cache, so proposed is stored as a read-only mapping and hit_clamps as a tuple.
+    """
+    __slots__ = ('proposed', 'achieved_weighted_score', 'hit_clamps')
+
+    proposed: Mapping[str, float]
     achieved_weighted_score: float
-    hit_clamps: List[str]
+    hit_clamps: Tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        # Copy the caller's containers so neither they nor cache readers can change a cached preview
+        object.__setattr__(self, 'proposed', MappingProxyType(dict(self.proposed)))
+        object.__setattr__(self, 'hit_clamps', tuple(self.hit_clamps))
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the preview as a dict, mirroring pydantic's model_dump()."""
+        return {
+            'proposed': dict(self.proposed),
+            'achieved_weighted_score': self.achieved_weighted_score,
+            'hit_clamps': list(self.hit_clamps)
+        }
 
 
 class ScoreAdjustmentRequest(BaseModel):
     """Request for score adjustment preview."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     selected_metrics: List[str]
     percent: float = Field(default=5.0, ge=0.1, le=50.0)
@@ -147,6 +202,8 @@ class ScoreAdjustmentRequest(BaseModel):
 
 class ScoreAdjustmentApply(BaseModel):
     """Request to apply score changes."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     changes: Dict[str, float]
     snapshot: Optional[str] = None  # Format: YYYYH1 or YYYYH2, defaults to current if not provided
@@ -154,32 +211,44 @@ class ScoreAdjustmentApply(BaseModel):
 
 class PercentileBucket(BaseModel):
     """Percentile bucket with members."""
+    model_config = ConfigDict(frozen=True)
+
     pct: int
     by_role: Dict[str, List[Dict[str, Any]]]
 
 
 class ExpectedRankingUpdate(BaseModel):
     """Expected ranking update model."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     rank: int
 
 
 class RoleUpdate(BaseModel):
     """Role update model."""
+    model_config = ConfigDict(frozen=True)
+
     alias: str
     role: str
 
 
 class BulkExpectedRankingUpdate(BaseModel):
     """Bulk expected ranking update request."""
+    model_config = ConfigDict(frozen=True)
+
     rankings: List[ExpectedRankingUpdate]
 
 
 class BulkRoleUpdate(BaseModel):
     """Bulk role update request."""
+    model_config = ConfigDict(frozen=True)
+
     roles: List[RoleUpdate]
 
 
 class ErrorResponse(BaseModel):
     """Error response model."""
+    model_config = ConfigDict(frozen=True)
+
     error: Dict[str, Any]
@@ -1,135 +1,329 @@
 """Core ranking algorithm implementation."""
 
+import inspect
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
 import pandas as pd
 
-from backend.models import Member, Metric, RankingEntry
+from backend.models import Metric, RankingEntry
 from backend.data_manager import DataManager
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel below runs as-is without it
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Number of (roles, snapshot) rankings kept per data version
+RANKINGS_CACHE_SIZE = 16
+
+
+class RoleMetricTable(NamedTuple):
+    """Metrics applicable to a role as parallel arrays, aligned by index."""
+    metrics: Tuple[Metric, ...]
+    names: Tuple[str, ...]
+    weights: np.ndarray
+    mins: np.ndarray
+    maxs: np.ndarray
+    name_to_idx: Dict[str, int]
+    int_weights: Optional[np.ndarray]  # int32 copy of weights when they are all whole numbers
+
+
+class RoleScoreBlock(NamedTuple):
+    """Stored scores of a role's members on the role's applicable metrics."""
+    aliases: Tuple[str, ...]
+    scores: np.ndarray  # member x metric, columns aligned with table.names; int16 when whole
+    row_of: Dict[str, int]
+    table: 'RoleMetricTable'  # The role's metric table at the data version the block was built from
+
+
+def _as_whole_numbers(values: np.ndarray, dtype: type) -> Optional[np.ndarray]:
+    """Get ``values`` as the given integer dtype, or None if that would not be exact."""
+    if values.size:
+        bounds = np.iinfo(dtype)
+        if not (np.isfinite(values).all() and (values == np.floor(values)).all()
+                and values.min() >= bounds.min and values.max() <= bounds.max):
+            return None
+    return values.astype(dtype)
+
+
+def _competition_rank_kernel(scores: np.ndarray, alias_order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Order a role cohort by weighted score (descending), then alias, and rank it.
+
+    ``alias_order`` sorts the cohort by alias; a stable sort by score on top
+    of it breaks score ties by alias. Tied members share the position of the
+    first of them (1, 1, 3, ...). Returns the cohort order and the rank of
+    each member in that order.
+    """
+    order = alias_order[np.argsort(-scores[alias_order], kind='mergesort')]
+    sorted_scores = scores[order]
+    starts = np.ones(order.shape[0], dtype=np.bool_)
+    starts[1:] = sorted_scores[1:] != sorted_scores[:-1]
+    ranks = np.flatnonzero(starts)[np.cumsum(starts) - 1] + 1
+    return order, ranks
+
+
+if njit is not None:
+    # nogil lets concurrent requests rank on several threads at once
+    _competition_rank_kernel = njit(cache=True, nogil=True)(_competition_rank_kernel)
+    # Compile at import time so the JIT cost stays out of request latency
+    _competition_rank_kernel(np.zeros(1), np.zeros(1, dtype=np.int64))
+
 
 class RankingEngine:
     """Handles weighted score calculation and ranking logic."""
     
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
+
+        # Only some data managers (SQLite) keep scores per snapshot; probe that once
+        self._get_score_frame = data_manager.get_score_frame
+        self._scores_support_snapshot = 'snapshot' in inspect.signature(self._get_score_frame).parameters
+
+        # (data version, per-role metric tables); Min/Max follow score updates
+        self._role_tables: Tuple[int, Dict[str, RoleMetricTable]] = (-1, {})
+
+        # (data version, per-(snapshot, role) score blocks)
+        self._score_blocks: Tuple[int, Dict[Tuple[Optional[str], str], RoleScoreBlock]] = (-1, {})
+
+        # (data version, LRU of rankings and weighted scores keyed on (roles, snapshot)); results
+        # are only published if no write landed while they were computed
+        self._rankings_cache: Tuple[int, "OrderedDict[tuple, Tuple[List[RankingEntry], Dict[str, float]]]"] = (
+            -1, OrderedDict())
+        self._rankings_lock = threading.Lock()
+
+        # (data version, alias sort order of each role cohort)
+        self._alias_orders: Tuple[int, Dict[str, np.ndarray]] = (-1, {})
+
+        # (role rankings, their ranks) per role, for bisecting; valid while those rankings are cached
+        self._rank_index: Dict[str, Tuple[List[RankingEntry], List[int]]] = {}
+
+        # Ordered mismatch list for the data version it was computed at
+        self._mismatch_cache: Tuple[int, List[RankingEntry]] = (-1, [])
     
     def calculate_weighted_scores(self, members: Optional[List[str]] = None,
                                 roles: Optional[List[str]] = None,
-                                snapshot: Optional[str] = None) -> Dict[str, float]:
-        """Calculate weighted scores for specified members and roles, optionally filtered by snapshot."""
+                                snapshot: Optional[str] = None,
+                                overrides: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, float]:
+        """Calculate weighted scores for specified members and roles, optionally filtered by snapshot.
+
+        ``overrides`` maps member aliases to metric scores that take precedence
+        over the stored scores, without modifying the data manager.
+        """
+        all_members = self.data_manager.get_members()
         if members is None:
-            members = [m.alias for m in self.data_manager.get_members()]
+            members = [m.alias for m in all_members]
 
         if roles is None:
             roles = self.data_manager.get_roles()
 
         # Get member-role mapping
-        member_roles = {}
-        for member in self.data_manager.get_members():
-            if member.alias in members and member.role in roles:
-                member_roles[member.alias] = member.role
-
-        # Get metrics and scores
-        metrics = self.data_manager.get_metrics()
+        member_set = set(members)
+        role_set = set(roles)
+        member_roles = {m.alias: m.role for m in all_members
+                        if m.alias in member_set and m.role in role_set}
 
-        # Check if data manager supports snapshot parameter
-        if hasattr(self.data_manager, 'get_member_scores') and 'snapshot' in self.data_manager.get_member_scores.__code__.co_varnames:
-            member_scores = self.data_manager.get_member_scores(snapshot=snapshot)
-        else:
-            member_scores = self.data_manager.get_member_scores()
-        
-        weighted_scores = {}
-        
+        # Members without scores weigh 0.0; the rest are scored per role below
+        weighted_scores = dict.fromkeys(member_roles, 0.0)
+        aliases_by_role: Dict[str, List[str]] = {}
         for member_alias, role in member_roles.items():
-            if member_alias not in member_scores:
-                logger.warning(f"No scores found for member: {member_alias}")
-                weighted_scores[member_alias] = 0.0
+            aliases_by_role.setdefault(role, []).append(member_alias)
+
+        for role, aliases in aliases_by_role.items():
+            block = self._get_role_score_block(role, snapshot)
+            scored = []
+            for member_alias in aliases:
+                if member_alias in block.row_of:
+                    scored.append(member_alias)
+                else:
+                    logger.warning(f"No scores found for member: {member_alias}")
+
+            # Only metrics with weight > 0 for this role count; the block's own table
+            # matches its columns even if the data changed since
+            table = block.table
+            if not scored or not table.names:
                 continue
-            
-            total_weighted_score = 0.0
-            
-            for metric in metrics:
-                # Only consider metrics with weight > 0 for this role
-                weight = metric.weights_by_role.get(role, 0.0)
-                if weight <= 0:
-                    continue
-                
-                # Get member's raw score for this metric
-                raw_score = member_scores[member_alias].get(metric.name, 0.0)
-                
-                # Calculate contribution: score × weight
-                contribution = raw_score * weight
-                total_weighted_score += contribution
-            
-            weighted_scores[member_alias] = total_weighted_score
+
+            # Fancy indexing copies, so overrides never touch the cached block
+            score_block = block.scores[[block.row_of[a] for a in scored]]
+            if overrides:
+                score_block = score_block.astype(np.float64, copy=False)
+                for row, member_alias in enumerate(scored):
+                    for name, value in overrides.get(member_alias, {}).items():
+                        col = table.name_to_idx.get(name)
+                        if col is not None:
+                            score_block[row, col] = value
+
+            if score_block.dtype == np.int16 and table.int_weights is not None:
+                # Whole scores and weights sum exactly in integers, in any order
+                totals = (score_block.astype(np.int64) @ table.int_weights).astype(np.float64)
+            else:
+                # Add score x weight metric by metric, in metric order, so every total
+                # is exactly the sequential sum (ties between members stay ties)
+                totals = np.zeros(len(scored))
+                for k, weight in enumerate(table.weights):
+                    totals += score_block[:, k] * weight
+
+            weighted_scores.update(zip(scored, totals.tolist()))
         
         return weighted_scores
     
-    def calculate_rankings(self, roles: Optional[List[str]] = None, snapshot: Optional[str] = None) -> List[RankingEntry]:
+    def calculate_rankings(self, roles: Optional[List[str]] = None, snapshot: Optional[str] = None,
+                           overrides: Optional[Dict[str, Dict[str, float]]] = None) -> List[RankingEntry]:
         """Calculate rankings within role cohorts using dense ranking, optionally filtered by snapshot."""
+        if overrides:
+            rankings, _ = self._compute_rankings_with_scores(roles, snapshot, overrides)
+            return rankings
+
+        rankings, _ = self._get_cached_rankings(roles, snapshot)
+        return list(rankings)
+    
+    def calculate_rankings_with_scores(self, roles: Optional[List[str]] = None, snapshot: Optional[str] = None,
+                                       overrides: Optional[Dict[str, Dict[str, float]]] = None
+                                       ) -> Tuple[List[RankingEntry], Dict[str, float]]:
+        """Calculate rankings along with the unrounded weighted scores they are based on.
+
+        Results without overrides are cached until the data version changes.
+        """
+        if overrides:
+            return self._compute_rankings_with_scores(roles, snapshot, overrides)
+
+        rankings, weighted_scores = self._get_cached_rankings(roles, snapshot)
+        return list(rankings), dict(weighted_scores)
+
+    def _get_cached_rankings(self, roles: Optional[List[str]], snapshot: Optional[str]
+                             ) -> Tuple[List[RankingEntry], Dict[str, float]]:
+        """Get the shared cached rankings and scores for the current data version; callers must not mutate them."""
+        version = self.data_manager.version
+
+        # Role order determines output order, so the key keeps it
+        key = (tuple(roles) if roles is not None else None, snapshot)
+        full = None
+        with self._rankings_lock:
+            cache_version, cache = self._rankings_cache
+            if cache_version == version:
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+                    return cached
+                full = cache.get((None, snapshot)) if roles is not None else None
+
+        if full is not None:
+            # Ranks are per role cohort, so a role subset is a filter of the full result
+            cached = self._select_roles(full, roles)
+        else:
+            cached = self._compute_rankings_with_scores(roles, snapshot, None)
+
+        # A write during the computation may have mixed two versions' data; don't keep that
+        if self.data_manager.version != version:
+            return cached
+
+        with self._rankings_lock:
+            cache_version, cache = self._rankings_cache
+            if cache_version != version:
+                if cache_version > version:
+                    return cached
+                cache = OrderedDict()
+                self._rankings_cache = (version, cache)
+            cache[key] = cached
+            if len(cache) > RANKINGS_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return cached
+    
+    @staticmethod
+    def _select_roles(full: Tuple[List[RankingEntry], Dict[str, float]], roles: List[str]
+                      ) -> Tuple[List[RankingEntry], Dict[str, float]]:
+        """Take the given roles, in order, from rankings computed for every role."""
+        rankings, weighted_scores = full
+        by_role: Dict[str, List[RankingEntry]] = {}
+        for entry in rankings:
+            by_role.setdefault(entry.role, []).append(entry)
+
+        selected = [entry for role in roles for entry in by_role.get(role, ())]
+        return selected, {entry.alias: weighted_scores[entry.alias] for entry in selected}
+
+    def _compute_rankings_with_scores(self, roles: Optional[List[str]], snapshot: Optional[str],
+                                      overrides: Optional[Dict[str, Dict[str, float]]]
+                                      ) -> Tuple[List[RankingEntry], Dict[str, float]]:
+        """Rank role cohorts by weighted score without consulting the cache."""
         if roles is None:
             roles = self.data_manager.get_roles()
 
         # Get all members for specified roles
-        all_members = self.data_manager.get_members()
-        filtered_members = [m for m in all_members if m.role in roles]
+        role_set = set(roles)
+        filtered_members = [m for m in self.data_manager.get_members() if m.role in role_set]
 
         # Calculate weighted scores
         member_aliases = [m.alias for m in filtered_members]
-        weighted_scores = self.calculate_weighted_scores(member_aliases, roles, snapshot=snapshot)
+        weighted_scores = self.calculate_weighted_scores(member_aliases, roles, snapshot=snapshot,
+                                                         overrides=overrides)
         
         # Get expected rankings
         expected_rankings = self.data_manager.get_expected_rankings()
         
-        # Group members by role and rank within each role
+        # Bucket aliases and weighted scores by role in one pass, as parallel lists
+        columns_by_role: Dict[str, Tuple[List[str], List[float]]] = {}
+        for member in filtered_members:
+            columns = columns_by_role.get(member.role)
+            if columns is None:
+                columns = columns_by_role[member.role] = ([], [])
+            columns[0].append(member.alias)
+            columns[1].append(weighted_scores.get(member.alias, 0.0))
+
+        # Rank within each role
         rankings = []
         
         for role in roles:
-            role_members = [m for m in filtered_members if m.role == role]
-            if not role_members:
+            if role not in columns_by_role:
                 continue
-            
-            # Create list of (member, weighted_score) tuples
-            role_data = []
-            for member in role_members:
-                score = weighted_scores.get(member.alias, 0.0)
-                role_data.append((member, score))
+            role_aliases, role_scores = columns_by_role[role]
             
             # Sort by weighted score (descending), then by alias for tie-breaking
-            role_data.sort(key=lambda x: (-x[1], x[0].alias))
-            
-            # Apply dense ranking
-            current_rank = 1
-            prev_score = None
-            
-            for i, (member, score) in enumerate(role_data):
-                # Dense ranking: same score = same rank, next different score gets next rank
-                if prev_score is not None and score != prev_score:
-                    current_rank = i + 1
-                
-                expected_rank = expected_rankings.get(member.alias)
-                mismatch = expected_rank is not None and expected_rank != current_rank
-                
-                ranking_entry = RankingEntry(
-                    alias=member.alias,
-                    role=member.role,
-                    weighted_score=round(score, 4),
+            order, ranks = _competition_rank_kernel(np.array(role_scores, dtype=np.float64),
+                                                    self._get_alias_order(role, role_aliases))
+
+            # Compare against expected ranks in one pass; members without one never mismatch
+            order_list = order.tolist()
+            expected = [expected_rankings.get(role_aliases[idx]) for idx in order_list]
+            expected_arr = np.fromiter((-1 if rank is None else rank for rank in expected),
+                                       dtype=np.int64, count=len(expected))
+            has_expected = np.fromiter((rank is not None for rank in expected), dtype=bool, count=len(expected))
+            mismatches = (expected_arr != ranks) & has_expected
+
+            for idx, current_rank, expected_rank, mismatch in zip(order_list, ranks.tolist(), expected,
+                                                                   mismatches.tolist()):
+                # Every field is already of its declared type, so skip pydantic validation
+                ranking_entry = RankingEntry.model_construct(
+                    alias=role_aliases[idx],
+                    role=role,
+                    weighted_score=round(role_scores[idx], 4),
                     rank=current_rank,
                     expected_rank=expected_rank,
                     mismatch=mismatch
                 )
                 
                 rankings.append(ranking_entry)
-                prev_score = score
         
-        return rankings
+        return rankings, weighted_scores
+    
+    def simulate_rankings(self, role: str, overrides: Dict[str, Dict[str, float]]) -> List[RankingEntry]:
+        """Calculate rankings for a role as if the given score overrides were applied."""
+        return self.calculate_rankings([role], overrides=overrides)
     
     def get_mismatches(self) -> List[RankingEntry]:
         """Get all members with rank ≠ expected rank, ordered by priority."""
-        all_rankings = self.calculate_rankings()
+        version = self.data_manager.version
+        cached_version, cached_mismatches = self._mismatch_cache
+        if cached_version == version:
+            return list(cached_mismatches)
+
+        all_rankings, _ = self._get_cached_rankings(None, None)
         mismatches = [r for r in all_rankings if r.mismatch]
         
         # Sort by role, then by the magnitude of rank difference
@@ -138,7 +332,9 @@ class RankingEngine:
             return (entry.role, -rank_diff, entry.alias)
         
         mismatches.sort(key=sort_key)
-        return mismatches
+        if self.data_manager.version == version:
+            self._mismatch_cache = (version, mismatches)
+        return list(mismatches)
     
     def get_reference_member(self, target_member: str, target_role: str,
                            current_rank: int, expected_rank: int) -> Optional[str]:
@@ -146,47 +342,144 @@ class RankingEngine:
         if expected_rank == current_rank:
             return None
 
-        # Get all members in the same role, sorted by rank
-        role_rankings = [r for r in self.calculate_rankings([target_role]) if r.role == target_role]
-        role_rankings.sort(key=lambda x: x.rank)
+        target_ref_rank = max(expected_rank, 1) if expected_rank < current_rank else expected_rank
+        role_rankings, _ = self._get_cached_rankings([target_role], None)
+        entry = self._first_ranked_at_or_after(target_role, role_rankings, target_ref_rank, target_member)
+        return entry.alias if entry else None
+    
+    def get_reference_members(self, target_member: str, target_role: str, current_rank: int,
+                              target_ranks: List[int]) -> Dict[int, Tuple[str, float]]:
+        """Get reference members and their weighted scores for several target ranks in one pass."""
+        # Unrounded scores, as the adjustment engine's ranking context returns them
+        role_rankings, weighted_scores = self._get_cached_rankings([target_role], None)
+        references = {}
+        for expected_rank in target_ranks:
+            if expected_rank == current_rank:
+                continue
 
-        if expected_rank < current_rank:
-            # Need to improve rank (move up), find member at expected rank or next available rank
-            target_ref_rank = expected_rank if expected_rank > 1 else 1
+            target_ref_rank = max(expected_rank, 1) if expected_rank < current_rank else expected_rank
 
-            # First try to find exact match at expected rank
-            for entry in role_rankings:
-                if entry.rank == target_ref_rank and entry.alias != target_member:
-                    return entry.alias
+            entry = self._first_ranked_at_or_after(target_role, role_rankings, target_ref_rank, target_member)
+            if entry:
+                references[expected_rank] = (entry.alias, weighted_scores[entry.alias])
 
-            # If no exact match, find the next available member at a rank >= expected_rank
-            for entry in role_rankings:
-                if entry.rank >= target_ref_rank and entry.alias != target_member:
-                    return entry.alias
-        else:
-            # Need to worsen rank (move down), find member at expected rank or next available rank
-            target_ref_rank = expected_rank
+        return references
+    
+    def _get_alias_order(self, role: str, aliases: List[str]) -> np.ndarray:
+        """Get the order that sorts a role cohort by alias, built once per data version."""
+        version = self.data_manager.version
+        orders_version, orders = self._alias_orders
+        if orders_version != version:
+            orders = {}
 
-            # First try to find exact match at expected rank
-            for entry in role_rankings:
-                if entry.rank == target_ref_rank and entry.alias != target_member:
-                    return entry.alias
+        # The cohort is the role's members in roster order, fixed for a data version
+        alias_order = orders.get(role)
+        if alias_order is None or len(alias_order) != len(aliases):
+            alias_order = np.argsort(np.array(aliases), kind='stable').astype(np.int64)
+            if self.data_manager.version == version:
+                orders = dict(orders)
+                orders[role] = alias_order
+                self._alias_orders = (version, orders)
+        return alias_order
 
-            # If no exact match, find the next available member at a rank >= expected_rank
-            for entry in role_rankings:
-                if entry.rank >= target_ref_rank and entry.alias != target_member:
-                    return entry.alias
+    def _first_ranked_at_or_after(self, role: str, role_rankings: List[RankingEntry], rank: int,
+                                  exclude: str) -> Optional[RankingEntry]:
+        """Get the member at the given rank of a role, or the next available rank after it."""
+        # A role's cached rankings are already in rank order
+        indexed = self._rank_index.get(role)
+        if indexed is not None and indexed[0] is role_rankings:
+            ranks = indexed[1]
+        else:
+            ranks = [entry.rank for entry in role_rankings]
+            self._rank_index[role] = (role_rankings, ranks)
 
+        for entry in role_rankings[bisect_left(ranks, rank):]:
+            if entry.alias != exclude:
+                return entry
         return None
-    
+
+    def _get_role_score_block(self, role: str, snapshot: Optional[str]) -> RoleScoreBlock:
+        """Get the stored scores of a role's members, built once per data version and snapshot."""
+        version = self.data_manager.version
+        blocks_version, blocks = self._score_blocks
+        if blocks_version != version:
+            blocks = {}
+
+        key = (snapshot, role)
+        block = blocks.get(key)
+        if block is None:
+            if self._scores_support_snapshot:
+                frame = self._get_score_frame(snapshot=snapshot)
+            else:
+                frame = self._get_score_frame()
+
+            # Slice every role's block from this one member x metric frame
+            names_by_role: Dict[str, List[str]] = {}
+            for m in self.data_manager.get_members():
+                if m.alias in frame.index:
+                    names_by_role.setdefault(m.role, []).append(m.alias)
+            names_by_role.setdefault(role, [])
+
+            # Build into a new dict and swap it in whole, only if no write landed meanwhile,
+            # so the published blocks always come from a single data version
+            built = dict(blocks)
+            for block_role, aliases in names_by_role.items():
+                table = self.get_role_metric_table(block_role)
+                # Metrics without a column score 0.0
+                scores = frame.reindex(index=aliases, columns=list(table.names),
+                                       fill_value=0.0).to_numpy(dtype=np.float64)
+                whole_scores = _as_whole_numbers(scores, np.int16)
+                built[(snapshot, block_role)] = RoleScoreBlock(
+                    aliases=tuple(aliases),
+                    scores=scores if whole_scores is None else whole_scores,
+                    row_of={a: i for i, a in enumerate(aliases)},
+                    table=table
+                )
+            block = built[key]
+            if self.data_manager.version == version:
+                self._score_blocks = (version, built)
+
+        return block
+
     def get_applicable_metrics(self, role: str) -> List[Metric]:
         """Get metrics applicable to a specific role (weight > 0)."""
-        all_metrics = self.data_manager.get_metrics()
-        applicable = []
-        
-        for metric in all_metrics:
-            weight = metric.weights_by_role.get(role, 0.0)
-            if weight > 0:
-                applicable.append(metric)
-        
-        return applicable
+        return list(self.get_role_metric_table(role).metrics)
+    
+    def get_role_metric_table(self, role: str) -> RoleMetricTable:
+        """Get the applicable metrics of a role with their weights and bounds, built once per data version."""
+        version = self.data_manager.version
+        tables_version, tables = self._role_tables
+        if tables_version != version:
+            tables = {}
+
+        table = tables.get(role)
+        if table is None:
+            all_metrics = self.data_manager.get_metrics()
+            roles = sorted({r for m in all_metrics for r in m.weights_by_role} | {role})
+
+            # Build every role's table from one dense metric x role weight matrix
+            weight_mat = np.array([[m.weights_by_role.get(r, 0.0) for r in roles] for m in all_metrics],
+                                  dtype=np.float64).reshape(len(all_metrics), len(roles))
+            all_mins = np.array([m.min_value for m in all_metrics], dtype=np.float64)
+            all_maxs = np.array([m.max_value for m in all_metrics], dtype=np.float64)
+
+            # Swapped in whole, only if no write landed while building
+            built = {}
+            for role_id, table_role in enumerate(roles):
+                idx = np.flatnonzero(weight_mat[:, role_id] > 0)
+                metrics = tuple(all_metrics[k] for k in idx.tolist())
+                weights = weight_mat[idx, role_id]
+                built[table_role] = RoleMetricTable(
+                    metrics=metrics,
+                    names=tuple(m.name for m in metrics),
+                    weights=weights,
+                    mins=all_mins[idx],
+                    maxs=all_maxs[idx],
+                    name_to_idx={m.name: i for i, m in enumerate(metrics)},
+                    int_weights=_as_whole_numbers(weights, np.int32)
+                )
+            table = built[role]
+            if self.data_manager.version == version:
+                self._role_tables = (version, built)
+
+        return table
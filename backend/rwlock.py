@@ -0,0 +1,87 @@
+"""Reader-writer lock for data shared between request threads."""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ReadWriteLock:
+    """Lock that lets many readers in at once but gives writers exclusive access.
+
+    Both sides are reentrant, and the thread holding the write lock may also
+    read. Waiting writers hold back new readers so a steady stream of reads
+    cannot starve them. A read lock cannot be upgraded to a write lock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self._local = threading.local()
+
+    def acquire_read(self) -> None:
+        """Block until no other thread holds or waits for the write lock."""
+        me = threading.get_ident()
+        depth = getattr(self._local, 'read_depth', 0)
+        with self._cond:
+            # Reentrant reads and reads under our own write lock never wait
+            if not depth and self._writer != me:
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+            self._readers += 1
+        self._local.read_depth = depth + 1
+
+    def release_read(self) -> None:
+        """Release one level of the calling thread's read lock."""
+        self._local.read_depth -= 1
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        """Block until the calling thread is the only one holding the lock."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'read_depth', 0):
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self) -> None:
+        """Release one level of the calling thread's write lock."""
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        """Hold the lock shared for the duration of the block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """Hold the lock exclusively for the duration of the block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
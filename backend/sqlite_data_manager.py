@@ -1,14 +1,16 @@
 """SQLite-based data management for the Team Stack Ranking Manager."""
 
 import logging
+import sqlite3
 import threading
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 import random
 
 import pandas as pd
-from sqlalchemy import create_engine, func, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import and_, create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker, Session, selectinload, raiseload
 from sqlalchemy.exc import IntegrityError
 
 from backend.models import (
@@ -19,6 +21,16 @@ from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Number of derived views kept; per-snapshot views beyond it are evicted oldest first
+VIEW_CACHE_SIZE = 32
+
+
+class RankingDataset(NamedTuple):
+    """Everything ranking reads for one snapshot, loaded by a single query."""
+    members: List[Member]
+    expected_rankings: Dict[str, int]
+    member_scores: Dict[str, Dict[str, float]]
+
 
 class SQLiteDataValidationError(Exception):
     """Custom exception for SQLite data validation errors."""
@@ -33,6 +45,18 @@ class SQLiteDataManager:
         self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         self._data_loaded = False
+
+        # Bumped on every write so derived lookups can be cached per version
+        self._data_version = 0
+
+        # Dedicated connection whose PRAGMA data_version moves whenever another
+        # connection or process commits, so external writes invalidate the caches too
+        self._probe_conn: Optional[sqlite3.Connection] = None
+        self._external_token: Optional[int] = None
+        self._lookup_version = -1
+        self._members_by_alias: Dict[str, Member] = {}
+        self._roles_by_alias: Dict[str, str] = {}
+        self._view_cache: "OrderedDict[Any, Tuple[int, Any]]" = OrderedDict()
         
         # Thread safety for concurrent data operations
         self._data_lock = threading.RLock()
@@ -47,6 +71,7 @@ class SQLiteDataManager:
                 Base.metadata.create_all(bind=self.engine)
                 self._run_migrations()
                 self._data_loaded = True
+                self._mark_written_unsafe()
                 logger.info("SQLite database initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize database: {e}")
@@ -70,6 +95,11 @@ class SQLiteDataManager:
                     conn.execute(text(f"UPDATE scores SET snapshot = '{current_snapshot}' WHERE snapshot IS NULL OR snapshot = '2024H2'"))
                     conn.commit()
                     logger.info("Successfully added snapshot column and updated existing records")
+
+                # create_all() only creates missing tables, so add indexes that older databases lack
+                for index in ScoreDB.__table__.indexes:
+                    index.create(bind=conn, checkfirst=True)
+                conn.commit()
         except Exception as e:
             logger.error(f"Migration failed: {e}")
             # Don't raise here - let the app continue with existing functionality
@@ -77,6 +107,74 @@ class SQLiteDataManager:
     def get_session(self) -> Session:
         """Get a database session."""
         return self.SessionLocal()
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the database is written, by this manager or anyone else."""
+        with self._data_lock:
+            self._sync_external_changes_unsafe()
+            return self._data_version
+
+    def _read_external_token_unsafe(self) -> int:
+        """Read the database's change counter on the probe connection (caller holds the lock)."""
+        if self._probe_conn is None:
+            self._probe_conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        return self._probe_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_external_changes_unsafe(self) -> None:
+        """Bump the data version if another connection committed since we last looked (caller holds the lock)."""
+        token = self._read_external_token_unsafe()
+        if token != self._external_token:
+            self._external_token = token
+            self._data_version += 1
+
+    def _mark_written_unsafe(self) -> None:
+        """Bump the data version after our own commit (caller holds the lock)."""
+        self._data_version += 1
+        # Our commit moved data_version too; take it as seen so it does not bump again
+        self._external_token = self._read_external_token_unsafe()
+
+    def _refresh_lookups_unsafe(self) -> None:
+        """Drop the alias lookup tables if the data changed (caller holds the lock)."""
+        self._sync_external_changes_unsafe()
+        if self._lookup_version == self._data_version:
+            return
+
+        self._members_by_alias = {m.alias: m for m in self.get_members()}
+        self._roles_by_alias = {alias: m.role for alias, m in self._members_by_alias.items()}
+        self._lookup_version = self._data_version
+
+    def _cached_view(self, key: Any, build: Callable[[], Any]) -> Any:
+        """Memoise a derived view for the current data version (caller holds the lock)."""
+        self._sync_external_changes_unsafe()
+        version, value = self._view_cache.get(key, (-1, None))
+        if version != self._data_version:
+            value = build()
+            self._view_cache[key] = (self._data_version, value)
+        self._view_cache.move_to_end(key)
+        if len(self._view_cache) > VIEW_CACHE_SIZE:
+            self._view_cache.popitem(last=False)
+        return value
+
+    def get_member_by_alias(self, alias: str) -> Optional[Member]:
+        """Get a single team member by alias."""
+        with self._data_lock:
+            self._refresh_lookups_unsafe()
+            return self._members_by_alias.get(alias)
+
+    def get_alias_role_map(self) -> Dict[str, str]:
+        """Get the role of every member keyed by alias."""
+        with self._data_lock:
+            self._refresh_lookups_unsafe()
+            return dict(self._roles_by_alias)
+
+    def get_scores_for(self, alias: str, snapshot: Optional[str] = None) -> Dict[str, float]:
+        """Get the scores of a single member for all metrics in a snapshot."""
+        with self._data_lock:
+            if snapshot is None:
+                snapshot = get_current_snapshot()
+
+            return dict(self._ranking_dataset(snapshot).member_scores.get(alias, {}))
     
     def load_data(self) -> None:
         """Load/validate data - for compatibility with existing interface."""
@@ -85,86 +183,129 @@ class SQLiteDataManager:
                 self._init_database()
             logger.info("SQLite data validated successfully")
     
+    def _ranking_dataset(self, snapshot: Optional[str] = None) -> RankingDataset:
+        """Get the roster, expected rankings and a snapshot's scores, queried once per version (caller holds the lock)."""
+        if snapshot is None:
+            snapshot = get_current_snapshot()
+        return self._cached_view(('ranking_dataset', snapshot), lambda: self._load_ranking_dataset(snapshot))
+
+    def _load_ranking_dataset(self, snapshot: str) -> RankingDataset:
+        """Query members with their expected rank and scores in a snapshot, in one round trip."""
+        # One row per (member, score) pair; members without scores still get one row
+        query = (
+            select(MemberDB.alias, MemberDB.role, ExpectedRankingDB.rank, MetricDB.name, ScoreDB.score)
+            .select_from(MemberDB)
+            .outerjoin(ExpectedRankingDB, ExpectedRankingDB.member_id == MemberDB.id)
+            .outerjoin(ScoreDB, and_(ScoreDB.member_id == MemberDB.id, ScoreDB.snapshot == snapshot))
+            .outerjoin(MetricDB, MetricDB.id == ScoreDB.metric_id)
+            .order_by(MemberDB.id)
+        )
+        with self.get_session() as session:
+            rows = session.execute(query).all()
+
+        members = {}
+        expected_rankings = {}
+        member_scores = {}
+        for alias, role, rank, metric_name, score in rows:
+            if alias not in members:
+                members[alias] = Member(alias=alias, role=role)
+                if rank is not None:
+                    expected_rankings[alias] = rank
+            if metric_name is not None:
+                # Convert integer score (0-10) to float
+                member_scores.setdefault(alias, {})[metric_name] = float(score)
+
+        return RankingDataset(
+            members=list(members.values()),
+            expected_rankings=expected_rankings,
+            member_scores=member_scores
+        )
+
     def get_members(self) -> List[Member]:
         """Get all team members."""
         with self._data_lock:
-            with self.get_session() as session:
-                members_db = session.query(MemberDB).all()
-                return [Member(alias=m.alias, role=m.role) for m in members_db]
+            return list(self._ranking_dataset().members)
     
     def get_roles(self) -> List[str]:
         """Get all unique roles."""
         with self._data_lock:
-            with self.get_session() as session:
-                roles = session.query(MemberDB.role).distinct().all()
-                return sorted([role[0] for role in roles])
+            return list(self._cached_view('roles', self._build_roles))
+
+    def _build_roles(self) -> List[str]:
+        """Collect the unique roles of the roster (caller holds the lock)."""
+        return sorted({m.role for m in self._ranking_dataset().members})
     
     def get_role_counts(self) -> Dict[str, int]:
         """Get count of members by role."""
         with self._data_lock:
-            with self.get_session() as session:
-                counts = session.query(
-                    MemberDB.role, 
-                    func.count(MemberDB.id)
-                ).group_by(MemberDB.role).all()
-                return {role: count for role, count in counts}
+            return dict(self._cached_view('role_counts', self._build_role_counts))
+
+    def _build_role_counts(self) -> Dict[str, int]:
+        """Count the roster's members by role, in role order (caller holds the lock)."""
+        counts: Dict[str, int] = {}
+        for member in self._ranking_dataset().members:
+            counts[member.role] = counts.get(member.role, 0) + 1
+        return dict(sorted(counts.items()))
     
     def get_metrics(self) -> List[Metric]:
         """Get all metrics with their role weights and bounds."""
         with self._data_lock:
-            with self.get_session() as session:
-                metrics_db = session.query(MetricDB).all()
-                metrics = []
-                
-                for metric_db in metrics_db:
-                    # Get weights by role
-                    weights_by_role = {}
-                    for weight_db in metric_db.weights:
-                        # Keep integer weight (0-1000) as-is for display
-                        weights_by_role[weight_db.role] = float(weight_db.weight)
-                    
-                    metrics.append(Metric(
-                        id=f"M{metric_db.id}",
-                        name=metric_db.name,
-                        weights_by_role=weights_by_role,
-                        min_value=metric_db.min_value,
-                        max_value=metric_db.max_value
-                    ))
-                
-                return metrics
-    
+            return list(self._cached_view('metrics', self._load_metrics))
+
+    def _load_metrics(self) -> List[Metric]:
+        """Query all metrics with their role weights and bounds."""
+        with self.get_session() as session:
+            # Load every metric's weights in one extra query and fail fast on any other lazy load
+            metrics_db = session.query(MetricDB).options(
+                selectinload(MetricDB.weights), raiseload('*')
+            ).all()
+            metrics = []
+
+            for metric_db in metrics_db:
+                # Get weights by role
+                weights_by_role = {}
+                for weight_db in metric_db.weights:
+                    # Keep integer weight (0-1000) as-is for display
+                    weights_by_role[weight_db.role] = float(weight_db.weight)
+
+                metrics.append(Metric(
+                    id=f"M{metric_db.id}",
+                    name=metric_db.name,
+                    weights_by_role=weights_by_role,
+                    min_value=metric_db.min_value,
+                    max_value=metric_db.max_value
+                ))
+
+            return metrics
+
     def get_member_scores(self, snapshot: Optional[str] = None) -> Dict[str, Dict[str, float]]:
         """Get all member scores for all metrics, optionally filtered by snapshot."""
         with self._data_lock:
-            with self.get_session() as session:
-                query = session.query(ScoreDB).join(MemberDB).join(MetricDB)
-
-                # Filter by snapshot if provided, otherwise use current snapshot
-                if snapshot is None:
-                    snapshot = get_current_snapshot()
-                query = query.filter(ScoreDB.snapshot == snapshot)
+            # Filter by snapshot if provided, otherwise use current snapshot
+            if snapshot is None:
+                snapshot = get_current_snapshot()
 
-                scores_db = query.all()
+            member_scores = self._ranking_dataset(snapshot).member_scores
+            return {member: dict(scores) for member, scores in member_scores.items()}
 
-                member_scores = {}
-                for score_db in scores_db:
-                    member_alias = score_db.member.alias
-                    metric_name = score_db.metric.name
-                    # Convert integer score (0-10) to float
-                    score_value = float(score_db.score)
+    def get_score_frame(self, snapshot: Optional[str] = None) -> pd.DataFrame:
+        """Get all member scores as a frame of members (rows) by metrics (columns), optionally filtered by snapshot."""
+        with self._data_lock:
+            if snapshot is None:
+                snapshot = get_current_snapshot()
 
-                    if member_alias not in member_scores:
-                        member_scores[member_alias] = {}
-                    member_scores[member_alias][metric_name] = score_value
+            frame = self._cached_view(('score_frame', snapshot), lambda: self._build_score_frame(snapshot))
+            return frame.copy()
 
-                return member_scores
+    def _build_score_frame(self, snapshot: str) -> pd.DataFrame:
+        """Lay out a snapshot's scores as a member x metric frame, missing scores as 0.0 (caller holds the lock)."""
+        member_scores = self._ranking_dataset(snapshot).member_scores
+        return pd.DataFrame.from_dict(member_scores, orient='index', dtype=float).fillna(0.0)
     
     def get_expected_rankings(self) -> Dict[str, int]:
         """Get expected rankings for members."""
         with self._data_lock:
-            with self.get_session() as session:
-                rankings_db = session.query(ExpectedRankingDB).join(MemberDB).all()
-                return {ranking.member.alias: ranking.rank for ranking in rankings_db}
+            return dict(self._ranking_dataset().expected_rankings)
 
     def get_available_snapshots(self) -> List[str]:
         """Get all available snapshots in the database."""
@@ -220,6 +361,7 @@ class SQLiteDataManager:
                             session.add(score)
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info(f"Updated scores for member: {member_alias} in snapshot: {snapshot}")
 
                 except Exception as e:
@@ -329,6 +471,7 @@ class SQLiteDataManager:
                         session.add(ranking_db)
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info("Successfully migrated data from CSV to SQLite")
 
                 except Exception as e:
@@ -352,14 +495,12 @@ class SQLiteDataManager:
                     roles = ["Dev", "PMO", "eTrading", "RISK"]
                     members_per_role = 10
 
-                    member_map = {}
-                    for role in roles:
-                        for i in range(1, members_per_role + 1):
-                            alias = f"{role}{i:02d}"
-                            member_db = MemberDB(alias=alias, role=role)
-                            session.add(member_db)
-                            session.flush()
-                            member_map[alias] = member_db.id
+                    # Insert rows in bulk and read the generated IDs back with one SELECT per table
+                    member_rows = [{"alias": f"{role}{i:02d}", "role": role}
+                                   for role in roles for i in range(1, members_per_role + 1)]
+                    session.execute(insert(MemberDB), member_rows)
+                    member_ids = dict(session.execute(select(MemberDB.alias, MemberDB.id)).all())
+                    member_map = {row["alias"]: member_ids[row["alias"]] for row in member_rows}
 
                     # Create metrics with role-specific weights
                     metrics_config = [
@@ -396,27 +537,24 @@ class SQLiteDataManager:
                         ("Issue Remediation", {"Dev": 0, "PMO": 0, "eTrading": 0, "RISK": 810}),
                     ]
 
-                    metric_map = {}
-                    for metric_name, role_weights in metrics_config:
-                        metric_db = MetricDB(
-                            name=metric_name,
-                            min_value=0.0,
-                            max_value=10.0
-                        )
-                        session.add(metric_db)
-                        session.flush()
-                        metric_map[metric_name] = metric_db.id
+                    session.execute(insert(MetricDB), [
+                        {"name": metric_name, "min_value": 0.0, "max_value": 10.0}
+                        for metric_name, _ in metrics_config
+                    ])
+                    metric_ids = dict(session.execute(select(MetricDB.name, MetricDB.id)).all())
+                    metric_map = {metric_name: metric_ids[metric_name] for metric_name, _ in metrics_config}
 
-                        # Add weights for each role
-                        for role, weight in role_weights.items():
-                            weight_db = MetricWeightDB(
-                                metric_id=metric_db.id,
-                                role=role,
-                                weight=weight
-                            )
-                            session.add(weight_db)
+                    # Add weights for each role
+                    session.execute(insert(MetricWeightDB), [
+                        {"metric_id": metric_map[metric_name], "role": role, "weight": weight}
+                        for metric_name, role_weights in metrics_config
+                        for role, weight in role_weights.items()
+                    ])
 
                     # Generate scores (0-10 integers)
+                    weights_by_metric = dict(metrics_config)
+                    snapshot = get_current_snapshot()
+                    score_rows = []
                     for member_alias, member_id in member_map.items():
                         # Extract role from member alias (e.g., "Dev01" -> "Dev")
                         member_role = ''.join([c for c in member_alias if not c.isdigit()])
@@ -425,36 +563,30 @@ class SQLiteDataManager:
 
                         for metric_name, metric_id in metric_map.items():
                             # Generate realistic scores based on role relevance
-                            role_weights = dict(metrics_config)[metric_name]
-                            if role_weights.get(member_role, 0) > 0:
+                            if weights_by_metric[metric_name].get(member_role, 0) > 0:
                                 # Higher scores for relevant metrics
                                 score = random.randint(3, 10)
                             else:
                                 # Lower scores for non-relevant metrics
                                 score = random.randint(0, 5)
 
-                            score_db = ScoreDB(
-                                member_id=member_id,
-                                metric_id=metric_id,
-                                score=score,
-                                snapshot=get_current_snapshot()
-                            )
-                            session.add(score_db)
+                            score_rows.append({"member_id": member_id, "metric_id": metric_id,
+                                               "score": score, "snapshot": snapshot})
+                    session.execute(insert(ScoreDB), score_rows)
 
                     # Generate expected rankings (1-10 for each role)
+                    ranking_rows = []
                     for role in roles:
                         role_members = [alias for alias in member_map.keys()
                                       if alias.startswith(role) or
                                       (role == "eTrading" and alias.startswith("ET"))]
 
                         for i, member_alias in enumerate(sorted(role_members), 1):
-                            ranking_db = ExpectedRankingDB(
-                                member_id=member_map[member_alias],
-                                rank=i
-                            )
-                            session.add(ranking_db)
+                            ranking_rows.append({"member_id": member_map[member_alias], "rank": i})
+                    session.execute(insert(ExpectedRankingDB), ranking_rows)
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info("Successfully seeded mock data")
 
                 except Exception as e:
@@ -532,6 +664,7 @@ class SQLiteDataManager:
                             processed_count += 1
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info(f"Successfully replaced data for snapshot {snapshot} with {processed_count} score records")
 
                 except Exception as e:
@@ -572,6 +705,7 @@ class SQLiteDataManager:
                         session.add(new_ranking)
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info(f"Successfully replaced expected rankings for {len(rankings)} members")
 
                 except SQLiteDataValidationError:
@@ -605,6 +739,7 @@ class SQLiteDataManager:
                         session.add(member)
 
                     session.commit()
+                    self._mark_written_unsafe()
                     logger.info(f"Successfully replaced all members with {len(roles)} new entries")
 
                 except SQLiteDataValidationError:
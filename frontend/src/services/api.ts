@@ -106,9 +106,10 @@ export const apiService = {
   },
 
   async getRankings(roles?: string[], snapshot?: string): Promise<RankingEntry[]> {
-    const params: Record<string, string> = {}
-    if (roles) params.roles = roles.join(',')
-    if (snapshot) params.snapshot = snapshot
+    // Send roles as repeated query parameters (?roles=a&roles=b)
+    const params = new URLSearchParams()
+    roles?.forEach(role => params.append('roles', role))
+    if (snapshot) params.append('snapshot', snapshot)
     const response = await api.get('/rankings', { params })
     return response.data
   },
@@ -139,7 +140,9 @@ export const apiService = {
   async applyAdjustment(request: ScoreAdjustmentApply): Promise<{
     ok: boolean
     updatedAt: string
-    rankings: RankingEntry[]
+    version: number
+    delta: RankingEntry[]
+    snapshot?: string | null
   }> {
     const response = await api.post('/adjust/apply', request)
     return response.data
@@ -1,16 +1,18 @@
 """Main FastAPI application for Team Stack Ranking Manager."""
 
+import asyncio
 import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 from backend.config import settings
 from backend.data_manager import DataValidationError
 from backend.sqlite_data_manager import SQLiteDataValidationError
 from backend.data_manager_factory import create_data_manager, get_data_source_info
-from backend.api import router, init_engines
+from backend.api import router, init_engines, warm_caches
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +47,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"Failed to start file watching: {e}. Continuing without auto-reload.")
 
+        # Prewarm ranking and percentile caches off the event loop
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, warm_caches)
+        except Exception as e:
+            logger.warning(f"Failed to warm caches: {e}. First requests will compute them.")
+
         logger.info("Data loaded and engines initialized successfully")
         yield
     except Exception as e:
@@ -63,7 +71,8 @@ app = FastAPI(
     title="Team Stack Ranking Manager",
     description="A web application for managers to view, compare, and adjust team member rankings",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -75,6 +84,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (rankings, scores, percentiles)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
 # Include API routes
 app.include_router(router, prefix="/api")
 
@@ -83,7 +99,7 @@ app.include_router(router, prefix="/api")
 async def data_validation_exception_handler(request, exc):
     """Handle data validation errors."""
     logger.error(f"Data validation error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"error": {"code": "DATA_VALIDATION_ERROR", "message": str(exc)}}
     )
@@ -93,7 +109,7 @@ async def data_validation_exception_handler(request, exc):
 async def sqlite_data_validation_exception_handler(request, exc):
     """Handle SQLite data validation errors."""
     logger.error(f"SQLite data validation error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"error": {"code": "SQLITE_DATA_VALIDATION_ERROR", "message": str(exc)}}
     )
@@ -103,7 +119,7 @@ async def sqlite_data_validation_exception_handler(request, exc):
 async def value_error_exception_handler(request, exc):
     """Handle value errors."""
     logger.error(f"Value error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"error": {"code": "INVALID_INPUT", "message": str(exc)}}
     )
@@ -113,7 +129,7 @@ async def value_error_exception_handler(request, exc):
 async def global_exception_handler(request, exc):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": {"code": "INTERNAL_ERROR", "message": "An internal error occurred"}}
     )
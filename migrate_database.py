@@ -5,11 +5,11 @@ Manual database migration script to add snapshot column to existing SQLite datab
 
 import sqlite3
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 
 def get_current_snapshot() -> str:
-    """Get the current snapshot in YYYYH1 or YYYYH2 format."""
-    now = datetime.now()
+    """Get the current snapshot in YYYYH1 or YYYYH2 format, based on the UTC date."""
+    now = datetime.now(timezone.utc)
     year = now.year
     # H1 is first half (Jan-Jun), H2 is second half (Jul-Dec)
     half = "H1" if now.month <= 6 else "H2"
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Test the clamped proportional distribution kernel behind adjustment previews.
+
+_ipf_clamp_kernel solves the clamped distribution in closed form. These
+checks pin its clamping behaviour and compare it against the iterative
+kernel it replaced.
+"""
+
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+import numpy as np
+
+from backend.adjustment_engine import EXACT_ROUNDING_LIMIT, AdjustmentEngine, _ipf_clamp_kernel
+from backend.data_manager import DataManager
+from backend.ranking_engine import RankingEngine
+
+
+def _kernel(weights, min_values, max_values, current, needed_delta, max_shift=np.inf):
+    """Run the kernel on plain lists."""
+    weights = np.array(weights, dtype=np.float64)
+    return _ipf_clamp_kernel(weights, np.array(min_values, dtype=np.float64),
+                             np.array(max_values, dtype=np.float64),
+                             np.array(current, dtype=np.float64), float(needed_delta), float(weights.sum()),
+                             float(max_shift))
+
+
+def _load_copy():
+    """Load rank.xlsx from a temporary copy so the tests never touch the real one."""
+    work = tempfile.mkdtemp()
+    shutil.copy("rank.xlsx", work)
+    dm = DataManager(os.path.join(work, "rank.xlsx"))
+    dm.load_data()
+    ranking_engine = RankingEngine(dm)
+    return dm, ranking_engine, AdjustmentEngine(dm, ranking_engine)
+
+
+def _rank_after(dm, alias, proposed):
+    """Apply a preview's proposal and return the member's new rank."""
+    dm.update_member_scores(alias, proposed)
+    return next(r.rank for r in RankingEngine(dm).calculate_rankings() if r.alias == alias)
+
+
+def _iterative_kernel(weights, min_values, max_values, current, needed_delta, max_iter=3, tol=0.001):
+    """The iterative kernel replaced by the closed form, as called with the old settings."""
+    proposed = current.copy()
+    hit_iteration = np.full(weights.shape[0], -1, dtype=np.int64)
+    weighted = weights != 0
+    remaining_delta = needed_delta
+    achieved_delta = 0.0
+
+    for iteration in range(max_iter):
+        if abs(remaining_delta) < tol:
+            break
+        available = hit_iteration < 0
+        if not available.any() or weights[available].sum() == 0:
+            break
+
+        available_weight = weights[available].sum()
+        step = np.flatnonzero(available & weighted)
+        step_weights = weights[step]
+        new_raw = proposed[step] + (remaining_delta * (step_weights / available_weight)) / step_weights
+        rounded = np.round(np.clip(new_raw, min_values[step], max_values[step]))
+        hit_iteration[step[np.abs(rounded - new_raw) > tol]] = iteration
+        proposed[step] = rounded
+
+        achieved_delta = ((proposed - current) * weights)[weighted].sum()
+        remaining_delta = needed_delta - achieved_delta
+
+    return achieved_delta
+
+
+def _unrounded_distribution(weights, min_values, max_values, current, needed_delta):
+    """Clamped proportional distribution before rounding, solved by bisection on the common shift."""
+    direction = 1.0 if needed_delta > 0 else -1.0
+    headroom = np.maximum(((max_values if needed_delta > 0 else min_values) - current) * direction, 0.0)
+    if (headroom * weights).sum() <= abs(needed_delta):
+        return current + direction * headroom
+
+    low, high = 0.0, headroom.max()
+    for _ in range(200):
+        shift = (low + high) / 2
+        if (np.minimum(headroom, shift) * weights).sum() < abs(needed_delta):
+            low = shift
+        else:
+            high = shift
+    return current + direction * np.minimum(headroom, (low + high) / 2)
+
+
+def _random_cases(count, seed=0):
+    """Random metric sets with whole-number scores and bounds, like the stored data."""
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        n = int(rng.integers(1, 8))
+        weights = rng.integers(1, 1000, n).astype(np.float64)
+        min_values = rng.integers(0, 5, n).astype(np.float64)
+        max_values = min_values + rng.integers(1, 15, n)
+        current = np.array([rng.integers(lo, hi + 1) for lo, hi in zip(min_values, max_values)], dtype=np.float64)
+        needed_delta = float(rng.uniform(-1.2, 1.2) * weights.sum() * 5)
+        yield weights, min_values, max_values, current, needed_delta
+
+
+def test_clamps_at_max():
+    """A metric without enough headroom stops at its maximum and the rest takes the residual."""
+    proposed, touched, hit_order, achieved = _kernel([1, 1], [0, 0], [10, 10], [9, 2], 6)
+    assert proposed.tolist() == [10, 7], proposed
+    assert touched.all()
+    assert hit_order.tolist() == [0, -1]
+    assert achieved == 6
+    print("✓ Clamps at the maximum")
+
+
+def test_clamps_at_min():
+    """A decrease clamps at the minimum the same way."""
+    proposed, _, hit_order, achieved = _kernel([2, 1], [3, 0], [10, 10], [4, 8], -8)
+    assert proposed.tolist() == [3, 2], proposed
+    assert hit_order.tolist() == [0, -1]
+    assert achieved == -8
+    print("✓ Clamps at the minimum")
+
+
+def test_zero_delta():
+    """No change is needed, so nothing moves."""
+    current = [5, 6, 7]
+    proposed, touched, hit_order, achieved = _kernel([3, 2, 1], [0, 0, 0], [10, 10, 10], current, 0)
+    assert proposed.tolist() == current
+    assert not touched.any()
+    assert (hit_order == -1).all()
+    assert achieved == 0.0
+    print("✓ Zero delta leaves the scores alone")
+
+
+def test_all_metrics_clamped():
+    """A delta beyond the total headroom puts every metric on its bound, clamped by headroom order."""
+    weights = [1, 2, 3]
+    current = [8, 5, 9]
+    proposed, touched, hit_order, achieved = _kernel(weights, [0, 0, 0], [10, 10, 10], current, 100)
+    assert proposed.tolist() == [10, 10, 10], proposed
+    assert touched.all()
+    assert hit_order.tolist() == [1, 2, 0], hit_order
+    assert achieved == 1 * 2 + 2 * 5 + 3 * 1
+    print("✓ All metrics clamp when the delta exceeds the headroom")
+
+
+def test_unweighted_metrics_untouched():
+    """Metrics with zero weight neither move nor count towards the achieved delta."""
+    proposed, touched, hit_order, achieved = _kernel([0, 2], [0, 0], [10, 10], [5, 5], 4)
+    assert proposed.tolist() == [5, 7], proposed
+    assert touched.tolist() == [False, True]
+    assert hit_order[0] == -1
+    assert achieved == 4
+    print("✓ Unweighted metrics are left alone")
+
+
+def test_not_worse_than_iterative_kernel():
+    """The closed form lands at least as close to the needed delta as the iterative kernel did."""
+    for weights, min_values, max_values, current, needed_delta in _random_cases(2000):
+        proposed, _, _, achieved = _ipf_clamp_kernel(weights, min_values, max_values, current,
+                                                     needed_delta, weights.sum(), np.inf)
+        previous = _iterative_kernel(weights, min_values, max_values, current, needed_delta)
+        assert abs(achieved - needed_delta) <= abs(previous - needed_delta) + 1e-9, \
+            (weights, min_values, max_values, current, needed_delta, achieved, previous)
+        assert ((proposed >= min_values) & (proposed <= max_values)).all()
+        assert achieved == ((proposed - current) * weights).sum()
+    print("✓ Never farther from the needed delta than the iterative kernel")
+
+
+def test_rounding_minimises_gap():
+    """No other choice of rounding each metric down or up lands closer to the needed delta."""
+    for weights, min_values, max_values, current, needed_delta in _random_cases(2000, seed=1):
+        proposed, _, _, achieved = _ipf_clamp_kernel(weights, min_values, max_values, current,
+                                                     needed_delta, weights.sum(), np.inf)
+        assert ((proposed >= min_values) & (proposed <= max_values)).all()
+
+        raw = _unrounded_distribution(weights, min_values, max_values, current, needed_delta)
+        choices = [sorted({np.floor(value + 1e-9), np.ceil(value - 1e-9)}) for value in raw]
+        best = min(abs(((np.array(scores) - current) * weights).sum() - needed_delta)
+                   for scores in itertools.product(*choices))
+        assert abs(achieved - needed_delta) <= best + 1e-6, \
+            (weights, min_values, max_values, current, needed_delta, achieved, best)
+    print("✓ Rounding lands as close to the needed delta as any rounding")
+
+
+def test_rounding_beyond_remainder_order():
+    """The closest rounding may skip a larger remainder when the weights differ."""
+    # Unrounded 4.25/14.25/2/4.25/1: rounding up only the weight-16 metric gets closest
+    proposed, _, _, achieved = _kernel([19, 16, 3, 1, 26], [3, 4, 2, 4, 1], [10, 16, 4, 9, 3],
+                                       [6, 16, 2, 6, 2], -88.9634277971551)
+    assert proposed.tolist() == [4, 15, 2, 4, 1], proposed
+    assert achieved == -82
+    print("✓ Rounding picks the closest combination, not just the largest remainders")
+
+
+def test_rounding_ties_prefer_largest_remainder():
+    """Among equally close roundings, the metric with the larger remainder is rounded up."""
+    # Unrounded 5.4 and 5.6 with equal weights: rounding up either one gives +1.0
+    proposed, _, _, achieved = _kernel([1, 1], [0, 0], [10, 10], [4.4, 4.6], 2)
+    assert proposed.tolist() == [5, 6], proposed
+    assert abs(achieved - 2) < 1e-9
+    print("✓ Rounding ties go to the largest remainder")
+
+
+def test_many_metrics_stay_in_bounds():
+    """Beyond the exact search limit the proposal still respects the bounds."""
+    rng = np.random.default_rng(2)
+    n = EXACT_ROUNDING_LIMIT + 4
+    for _ in range(200):
+        weights = rng.integers(1, 1000, n).astype(np.float64)
+        min_values = np.zeros(n)
+        max_values = np.full(n, 10.0)
+        current = rng.integers(0, 11, n).astype(np.float64)
+        needed_delta = float(rng.uniform(-1, 1) * weights.sum() * 3)
+        proposed, _, _, achieved = _ipf_clamp_kernel(weights, min_values, max_values, current,
+                                                     needed_delta, weights.sum(), np.inf)
+        assert ((proposed >= min_values) & (proposed <= max_values)).all()
+        assert (proposed == np.round(proposed)).all()
+        assert abs(achieved - ((proposed - current) * weights).sum()) < 1e-6
+    print("✓ Large metric sets stay within bounds")
+
+
+def test_rounding_stays_short_of_bound():
+    """No rounding reaches max_shift, and none that stays short of it lands closer."""
+    for weights, min_values, max_values, current, needed_delta in _random_cases(2000, seed=3):
+        # The preview keeps the unrounded target 0.01 short of the bound member
+        max_shift = abs(needed_delta) + 0.01
+        proposed, _, _, achieved = _ipf_clamp_kernel(weights, min_values, max_values, current,
+                                                     needed_delta, weights.sum(), max_shift)
+        direction = 1.0 if needed_delta > 0 else -1.0
+        assert direction * achieved < max_shift, (weights, current, needed_delta, achieved)
+        assert ((proposed >= min_values) & (proposed <= max_values)).all()
+
+        raw = _unrounded_distribution(weights, min_values, max_values, current, needed_delta)
+        choices = [sorted({np.floor(value + 1e-9), np.ceil(value - 1e-9)}) for value in raw]
+        achievable = [((np.array(scores) - current) * weights).sum() for scores in itertools.product(*choices)]
+        best = min(abs(delta - needed_delta) for delta in achievable if direction * delta < max_shift)
+        assert abs(achieved - needed_delta) <= best + 1e-6, \
+            (weights, min_values, max_values, current, needed_delta, achieved, best)
+    print("✓ Rounding stays short of the bound")
+
+
+def test_preview_rounding_keeps_one_level():
+    """Rounding a downward preview does not drop the member past the bound member."""
+    # Dev10 is rank 1, expected rank 2; the target is bounded just above Dev08 at rank 3
+    dm, _, adjustment_engine = _load_copy()
+    preview = adjustment_engine.preview_adjustment('Dev10', ['Code Quality', 'Velocity', 'Architecture'], 20)
+    assert preview.achieved_weighted_score > 42080, preview.achieved_weighted_score
+    assert _rank_after(dm, 'Dev10', preview.proposed) == 2
+    print("✓ Preview rounding keeps a one-level move")
+
+
+def test_preview_to_rank_one_can_tie_the_leader():
+    """Moving up to rank 1 is not bounded by the leader it has to reach."""
+    # Dev09 is rank 2, expected rank 1; maxing every metric ties Dev10 for rank 1
+    dm, ranking_engine, adjustment_engine = _load_copy()
+    metrics = [m.name for m in ranking_engine.get_applicable_metrics('Dev')]
+    preview = adjustment_engine.preview_adjustment('Dev09', metrics, 5)
+    assert _rank_after(dm, 'Dev09', preview.proposed) == 1
+    print("✓ Preview to rank 1 reaches the leader")
+
+
+def test_cached_preview_is_read_only():
+    """A cached preview cannot be changed through its proposed scores or clamp list."""
+    dm, _, adjustment_engine = _load_copy()
+    selected = ['Code Quality', 'Velocity', 'Architecture']
+    preview = adjustment_engine.preview_adjustment('Dev10', selected, 20)
+    expected = preview.model_dump()
+
+    for mutate in (lambda: preview.proposed.update({'Velocity': 0.0}),
+                   lambda: preview.proposed.__setitem__('Velocity', 0.0),
+                   lambda: preview.hit_clamps.append('Velocity')):
+        try:
+            mutate()
+        except (TypeError, AttributeError):
+            pass
+        else:
+            raise AssertionError("a cached preview was modified")
+
+    dumped = preview.model_dump()
+    dumped['proposed']['Velocity'] = 0.0
+    dumped['hit_clamps'].append('Velocity')
+    cached = adjustment_engine.preview_adjustment('Dev10', selected, 20)
+    assert cached is preview and cached.model_dump() == expected
+    print("✓ Cached previews are read-only")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_clamps_at_max, test_clamps_at_min, test_zero_delta, test_all_metrics_clamped,
+                 test_unweighted_metrics_untouched, test_not_worse_than_iterative_kernel,
+                 test_rounding_minimises_gap, test_rounding_beyond_remainder_order,
+                 test_rounding_ties_prefer_largest_remainder, test_many_metrics_stay_in_bounds,
+                 test_rounding_stays_short_of_bound, test_preview_rounding_keeps_one_level,
+                 test_preview_to_rank_one_can_tie_the_leader, test_cached_preview_is_read_only):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
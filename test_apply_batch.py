@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Test the batched apply queue behind POST /api/adjust/apply.
+
+Applies arriving within APPLY_BATCH_WINDOW are applied in order and saved
+once. Each response carries the version and ranking delta of its own
+change; a failing change or save only fails the requests it affects.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+import orjson
+from fastapi import HTTPException
+
+from backend import api
+from backend.adjustment_engine import AdjustmentEngine
+from backend.data_manager import DataManager
+from backend.models import ScoreAdjustmentApply
+from backend.ranking_engine import RankingEngine
+
+
+def _load_copy():
+    """Load rank.xlsx from a temporary copy and count its saves."""
+    work = tempfile.mkdtemp()
+    shutil.copy("rank.xlsx", work)
+    dm = DataManager(os.path.join(work, "rank.xlsx"))
+    dm.load_data()
+    ranking_engine = RankingEngine(dm)
+    adjustment_engine = AdjustmentEngine(dm, ranking_engine)
+
+    saves = []
+    save_data = dm.save_data
+
+    def counting_save():
+        saves.append(dm.version)
+        save_data()
+
+    dm.save_data = counting_save
+    return dm, ranking_engine, adjustment_engine, saves
+
+
+def _valid_changes(dm, ranking_engine, adjustment_engine, count):
+    """Find changes for `count` members that move their weighted score and pass validation."""
+    found = []
+    for member in dm.get_members():
+        scores = dm.get_scores_for(member.alias)
+        for metric in ranking_engine.get_applicable_metrics(member.role):
+            changes = {metric.name: scores[metric.name] + 1}
+            is_valid, _ = adjustment_engine.validate_one_level_restriction(member.alias, changes)
+            if is_valid:
+                found.append(ScoreAdjustmentApply(alias=member.alias, changes=changes))
+                break
+        if len(found) == count:
+            return found
+    raise AssertionError("not enough members with a valid one-level change")
+
+
+def _expected_delta(dm, request):
+    """Replay one change on a fresh engine and return the ranking rows it moves."""
+    engine = RankingEngine(dm)
+    before = {r.alias: (r.rank, r.weighted_score) for r in engine.calculate_rankings()}
+    dm.update_member_scores(request.alias, request.changes)
+    return [r.model_dump() for r in engine.calculate_rankings()
+            if before.get(r.alias) != (r.rank, r.weighted_score)]
+
+
+async def _apply(request, dm, ranking_engine, adjustment_engine):
+    """Call the endpoint and return the decoded body."""
+    response = await api.apply_adjustment(request, dm, ranking_engine, adjustment_engine)
+    return orjson.loads(response.body)
+
+
+def test_batch_saves_once_with_per_change_deltas():
+    """Changes within the window are saved once, each with its own version and delta."""
+    dm, ranking_engine, adjustment_engine, saves = _load_copy()
+    first, second = _valid_changes(dm, ranking_engine, adjustment_engine, 2)
+
+    async def run():
+        return await asyncio.gather(
+            _apply(first, dm, ranking_engine, adjustment_engine),
+            _apply(second, dm, ranking_engine, adjustment_engine)
+        )
+
+    first_result, second_result = asyncio.run(run())
+    assert len(saves) == 1, f"expected one save for the batch, got {len(saves)}"
+    assert first_result["version"] < second_result["version"] == saves[0]
+
+    # Each delta is what its own change moved, before later changes in the batch
+    replay, _, _, _ = _load_copy()
+    assert first_result["delta"] == orjson.loads(orjson.dumps(_expected_delta(replay, first)))
+    assert second_result["delta"] == orjson.loads(orjson.dumps(_expected_delta(replay, second)))
+    assert any(r["alias"] == first.alias for r in first_result["delta"])
+    print("✓ Batched changes save once with per-change deltas")
+
+
+def test_window_separates_batches():
+    """A change arriving after the window has closed is applied and saved in its own batch."""
+    dm, ranking_engine, adjustment_engine, saves = _load_copy()
+    first, second = _valid_changes(dm, ranking_engine, adjustment_engine, 2)
+
+    async def run():
+        first_task = asyncio.create_task(_apply(first, dm, ranking_engine, adjustment_engine))
+        await asyncio.sleep(api.APPLY_BATCH_WINDOW * 4)
+        assert first_task.done(), "first change still pending after its window"
+        await _apply(second, dm, ranking_engine, adjustment_engine)
+
+    asyncio.run(run())
+    assert len(saves) == 2, f"expected one save per window, got {len(saves)}"
+    print("✓ Changes in separate windows are saved separately")
+
+
+def test_failed_change_only_fails_itself():
+    """An invalid change is rejected while the rest of its batch is applied and saved."""
+    dm, ranking_engine, adjustment_engine, saves = _load_copy()
+    valid, = _valid_changes(dm, ranking_engine, adjustment_engine, 1)
+    invalid = ScoreAdjustmentApply(alias=valid.alias, changes={"No Such Metric": 1.0})
+
+    async def run():
+        return await asyncio.gather(
+            _apply(invalid, dm, ranking_engine, adjustment_engine),
+            _apply(valid, dm, ranking_engine, adjustment_engine),
+            return_exceptions=True
+        )
+
+    invalid_result, valid_result = asyncio.run(run())
+    assert isinstance(invalid_result, HTTPException) and invalid_result.status_code == 400
+    assert valid_result["ok"]
+    assert len(saves) == 1
+    metric, score = next(iter(valid.changes.items()))
+    assert dm.get_scores_for(valid.alias)[metric] == score
+    print("✓ A failed change does not fail its batch")
+
+
+def test_save_failure_fails_applied_changes():
+    """When the save fails, every change applied in the batch reports the failure."""
+    dm, ranking_engine, adjustment_engine, _ = _load_copy()
+    first, second = _valid_changes(dm, ranking_engine, adjustment_engine, 2)
+
+    def failing_save():
+        raise OSError("disk full")
+
+    dm.save_data = failing_save
+
+    async def run():
+        return await asyncio.gather(
+            _apply(first, dm, ranking_engine, adjustment_engine),
+            _apply(second, dm, ranking_engine, adjustment_engine),
+            return_exceptions=True
+        )
+
+    for result in asyncio.run(run()):
+        assert isinstance(result, HTTPException) and result.status_code == 500, result
+    print("✓ A failed save fails every applied change")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_batch_saves_once_with_per_change_deltas, test_window_separates_batches,
+                 test_failed_change_only_fails_itself, test_save_failure_fails_applied_changes):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""Test that engine caches never keep results computed across a concurrent write.
+
+Each test forces the problematic interleaving deterministically: while a
+result is being computed for data version N, a write moves the data to
+N+1 and another reader repopulates the cache for N+1. The result built
+from version N must not be served afterwards.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+from backend.data_manager import DataManager
+from backend.ranking_engine import RankingEngine
+from backend.adjustment_engine import AdjustmentEngine
+
+
+def _load_copy() -> DataManager:
+    """Load rank.xlsx from a temporary copy so the tests never touch the real one."""
+    work = tempfile.mkdtemp()
+    shutil.copy("rank.xlsx", work)
+    dm = DataManager(os.path.join(work, "rank.xlsx"))
+    dm.load_data()
+    return dm
+
+
+def _score_change(dm: DataManager, engine: RankingEngine):
+    """Pick a member and a score change that moves its weighted score."""
+    member = dm.get_members()[0]
+    metric = engine.get_applicable_metrics(member.role)[0].name
+    current = dm.get_scores_for(member.alias)[metric]
+    return member, {metric: 0.0 if current else 10.0}
+
+
+def _fresh_rankings(dm: DataManager):
+    """Rankings from a new engine with empty caches."""
+    return [r.model_dump() for r in RankingEngine(dm).calculate_rankings()]
+
+
+def test_rankings_cache_skips_stale_result():
+    """A ranking computed across a write is returned once but never cached."""
+    dm = _load_copy()
+    engine = RankingEngine(dm)
+    member, changes = _score_change(dm, engine)
+    compute = engine._compute_rankings_with_scores
+    raced = []
+
+    def racing_compute(roles, snapshot, overrides):
+        result = compute(roles, snapshot, overrides)
+        if not raced:
+            raced.append(True)
+            # A write lands and another reader caches rankings for the new version
+            dm.update_member_scores(member.alias, changes)
+            engine.calculate_rankings()
+        return result
+
+    engine._compute_rankings_with_scores = racing_compute
+    engine.calculate_rankings()
+
+    assert [r.model_dump() for r in engine.calculate_rankings()] == _fresh_rankings(dm), \
+        "rankings computed before the write were cached for the new version"
+    print("✓ Rankings cache skips results computed across a write")
+
+
+def test_score_block_cache_skips_stale_result():
+    """Score blocks sliced from a frame read before a write are never cached."""
+    dm = _load_copy()
+    engine = RankingEngine(dm)
+    member, changes = _score_change(dm, engine)
+    get_frame = engine._get_score_frame
+    raced = []
+
+    def racing_get_frame(**kwargs):
+        frame = get_frame(**kwargs)
+        if not raced:
+            raced.append(True)
+            # A write lands and another reader caches blocks for the new version
+            dm.update_member_scores(member.alias, changes)
+            engine.calculate_weighted_scores()
+        return frame
+
+    engine._get_score_frame = racing_get_frame
+    engine.calculate_weighted_scores()
+
+    assert engine.calculate_weighted_scores() == RankingEngine(dm).calculate_weighted_scores(), \
+        "score blocks read before the write were cached for the new version"
+    print("✓ Score block cache skips blocks built across a write")
+
+
+def test_role_table_cache_skips_stale_result():
+    """Role metric tables built from metrics read before a write are never cached."""
+    dm = _load_copy()
+    engine = RankingEngine(dm)
+    member = dm.get_members()[0]
+    table = engine.get_role_metric_table(member.role)
+    # A score above the metric's maximum moves its Max bound
+    changes = {table.names[0]: table.maxs[0] + 50}
+    engine = RankingEngine(dm)
+    get_metrics = dm.get_metrics
+    raced = []
+
+    def racing_get_metrics():
+        metrics = get_metrics()
+        if not raced:
+            raced.append(True)
+            # A write lands and another reader caches tables for the new version
+            dm.update_member_scores(member.alias, changes)
+            engine.get_role_metric_table(member.role)
+        return metrics
+
+    dm.get_metrics = racing_get_metrics
+    engine.get_role_metric_table(member.role)
+    del dm.get_metrics
+
+    cached = engine.get_role_metric_table(member.role)
+    fresh = RankingEngine(dm).get_role_metric_table(member.role)
+    assert list(cached.maxs) == list(fresh.maxs), \
+        "a role table built before the write was cached for the new version"
+    print("✓ Role table cache skips tables built across a write")
+
+
+def test_ranking_ctx_cache_skips_stale_result():
+    """A role's ranking context computed across a write is never cached."""
+    dm = _load_copy()
+    ranking_engine = RankingEngine(dm)
+    adjustment_engine = AdjustmentEngine(dm, ranking_engine)
+    member, changes = _score_change(dm, ranking_engine)
+    compute = ranking_engine.calculate_rankings_with_scores
+    raced = []
+
+    def racing_compute(roles):
+        result = compute(roles)
+        if not raced:
+            raced.append(True)
+            # A write lands and another reader caches the context for the new version
+            dm.update_member_scores(member.alias, changes)
+            adjustment_engine._cached_ranking_ctx(member.role)
+        return result
+
+    ranking_engine.calculate_rankings_with_scores = racing_compute
+    adjustment_engine._cached_ranking_ctx(member.role)
+
+    cached = adjustment_engine._cached_ranking_ctx(member.role)
+    fresh = RankingEngine(dm).calculate_rankings_with_scores([member.role])[1]
+    assert cached.weighted_scores == fresh, \
+        "a ranking context computed before the write was cached for the new version"
+    print("✓ Ranking context cache skips contexts computed across a write")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_rankings_cache_skips_stale_result, test_score_block_cache_skips_stale_result,
+                 test_role_table_cache_skips_stale_result, test_ranking_ctx_cache_skips_stale_result):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Test that the data file watcher reloads on changes to the watched workbook."""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import traceback
+sys.path.append('.')
+
+from backend.data_manager import DataManager
+from backend.file_watcher import DataFileWatcher
+
+
+def _watch(excel_path: str):
+    """Start a watcher whose reloads are recorded instead of performed."""
+    dm = DataManager(excel_path)
+    dm.load_data()
+    watcher = DataFileWatcher(dm, debounce_seconds=0.05)
+    reloaded = threading.Event()
+    watcher._reload_data = reloaded.set
+    watcher.start_watching()
+    return watcher, reloaded
+
+
+def test_symlinked_workbook_change():
+    """Writing the symlink target of the workbook triggers a reload."""
+    target = os.path.join(tempfile.mkdtemp(), "team-data.xlsx")
+    shutil.copy("rank.xlsx", target)
+    link = os.path.join(tempfile.mkdtemp(), "rank.xlsx")
+    os.symlink(target, link)
+
+    watcher, reloaded = _watch(link)
+    try:
+        with open(target, "ab") as f:
+            f.write(b"\0")
+        assert reloaded.wait(2.0), "a change to the symlink target was not seen"
+    finally:
+        watcher.stop_watching()
+    print("✓ Symlinked workbook changes trigger a reload")
+
+
+def test_failed_reload_backs_off():
+    """Polling does not retry a failed reload until a data file is written again."""
+    path = os.path.join(tempfile.mkdtemp(), "rank.xlsx")
+    shutil.copy("rank.xlsx", path)
+    dm = DataManager(path)
+    dm.load_data()
+
+    attempts = []
+
+    def failing_reload():
+        attempts.append(time.monotonic())
+        raise OSError("workbook is locked")
+
+    dm.reload_changed = failing_reload
+    watcher = DataFileWatcher(dm, debounce_seconds=0.05)
+    watcher.poll_seconds = 0.05
+    watcher.start_watching()
+    try:
+        with open(path, "ab") as f:
+            f.write(b"\0")
+        time.sleep(0.5)
+        assert attempts, "the change was never reloaded"
+        settled = len(attempts)
+        time.sleep(0.5)
+        assert len(attempts) == settled, f"a failed reload was retried {len(attempts) - settled} more times"
+
+        with open(path, "ab") as f:
+            f.write(b"\0")
+        time.sleep(0.5)
+        assert len(attempts) > settled, "a new write after a failure was not reloaded"
+    finally:
+        watcher.stop_watching()
+    print("✓ Failed reloads are retried only after a new write")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_symlinked_workbook_change, test_failed_reload_backs_off):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Test the per-version rankings cache of RankingEngine."""
+
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+from itertools import permutations
+sys.path.append('.')
+
+from backend.data_manager import DataManager
+from backend.ranking_engine import RANKINGS_CACHE_SIZE, RankingEngine
+
+
+def _load_copy() -> DataManager:
+    """Load rank.xlsx from a temporary copy so the tests never touch the real one."""
+    work = tempfile.mkdtemp()
+    shutil.copy("rank.xlsx", work)
+    dm = DataManager(os.path.join(work, "rank.xlsx"))
+    dm.load_data()
+    return dm
+
+
+def test_cache_is_bounded():
+    """Ranking many role orders keeps at most RANKINGS_CACHE_SIZE results."""
+    dm = _load_copy()
+    engine = RankingEngine(dm)
+    orders = list(permutations(dm.get_roles()))
+    assert len(orders) > RANKINGS_CACHE_SIZE
+
+    for roles in orders:
+        engine.calculate_rankings(list(roles))
+    assert len(engine._rankings_cache[1]) == RANKINGS_CACHE_SIZE
+    print("✓ Rankings cache stays bounded")
+
+
+def test_evicted_subsets_match_full_ranking():
+    """Role subsets served after evictions still match the full ranking."""
+    dm = _load_copy()
+    engine = RankingEngine(dm)
+    full = [r.model_dump() for r in RankingEngine(dm).calculate_rankings()]
+
+    for roles in permutations(dm.get_roles()):
+        rankings = [r.model_dump() for r in engine.calculate_rankings(list(roles))]
+        expected = [r for role in roles for r in full if r["role"] == role]
+        assert rankings == expected, roles
+    print("✓ Role subsets match the full ranking after evictions")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_cache_is_bounded, test_evicted_subsets_match_full_ranking):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
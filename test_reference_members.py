@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test that both engines resolve the same reference members and scores."""
+
+import os
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+import pandas as pd
+
+from backend.data_manager import DataManager
+from backend.ranking_engine import RankingEngine
+from backend.adjustment_engine import AdjustmentEngine
+
+
+def _load_fractional_copy() -> DataManager:
+    """Load a copy of rank.xlsx whose role weights have fractions, so weighted scores do too."""
+    sheets = pd.read_excel("rank.xlsx", sheet_name=None)
+    scores = sheets["Scores"]
+    roles = sheets["Roles"]["role"].unique().tolist()
+    scores[roles] = scores[roles] + 1 / 3
+
+    path = os.path.join(tempfile.mkdtemp(), "rank.xlsx")
+    with pd.ExcelWriter(path) as writer:
+        for name, sheet in sheets.items():
+            sheet.to_excel(writer, sheet_name=name, index=False)
+
+    dm = DataManager(path)
+    dm.load_data()
+    return dm
+
+
+def test_reference_members_match():
+    """RankingEngine and the adjustment engine's ranking context agree, down to unrounded scores."""
+    dm = _load_fractional_copy()
+    ranking_engine = RankingEngine(dm)
+    adjustment_engine = AdjustmentEngine(dm, ranking_engine)
+    weighted_scores = ranking_engine.calculate_weighted_scores()
+    assert any(round(score, 4) != score for score in weighted_scores.values()), \
+        "weighted scores have no digits beyond the fourth decimal to compare"
+
+    for entry in ranking_engine.calculate_rankings():
+        target_ranks = list(range(1, len(dm.get_members()) + 1))
+        expected = adjustment_engine._cached_ranking_ctx(entry.role).get_reference_members(
+            entry.alias, entry.rank, target_ranks
+        )
+        references = ranking_engine.get_reference_members(entry.alias, entry.role, entry.rank, target_ranks)
+        assert references == expected, (entry.alias, references, expected)
+        for alias, score in references.values():
+            assert score == weighted_scores[alias]
+    print("✓ Reference members and unrounded scores match across engines")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_reference_members_match,):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test the cache of serialized GET responses behind the ETag endpoints."""
+
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import api
+from backend.sqlite_data_manager import SQLiteDataManager
+
+
+def _client():
+    """Serve the API over a temporary copy of ranking.db."""
+    db_path = os.path.join(tempfile.mkdtemp(), "ranking.db")
+    shutil.copy("ranking.db", db_path)
+    dm = SQLiteDataManager(db_path)
+    api.init_engines(dm)
+    app = FastAPI()
+    app.include_router(api.router, prefix="/api")
+    return TestClient(app), dm
+
+
+def test_cache_is_bounded():
+    """Requesting many distinct snapshots keeps at most RESPONSE_CACHE_SIZE bodies."""
+    client, _ = _client()
+    for year in range(2000, 2000 + api.RESPONSE_CACHE_SIZE):
+        for half in ("H1", "H2"):
+            assert client.get("/api/scores", params={"snapshot": f"{year}{half}"}).status_code == 200
+    assert len(api._response_cache) == api.RESPONSE_CACHE_SIZE
+    print("✓ Response cache stays bounded")
+
+
+def test_malformed_snapshot_not_cached():
+    """Snapshots that are not YYYYH1/YYYYH2 are served but never cached."""
+    client, _ = _client()
+    response = client.get("/api/scores", params={"snapshot": "not-a-snapshot"})
+    assert response.status_code == 200
+    assert not any("not-a-snapshot" in key for key in api._response_cache)
+    print("✓ Malformed snapshots are not cached")
+
+
+def test_current_snapshot_rollover():
+    """A new current snapshot changes the ETag and the body without a data write."""
+    client, dm = _client()
+    first = client.get("/api/scores")
+    assert first.json()["current_snapshot"] == dm.get_current_snapshot()
+
+    dm.get_current_snapshot = lambda: "2099H2"
+    second = client.get("/api/scores", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200, "a stale current snapshot was confirmed by the old ETag"
+    assert second.headers["etag"] != first.headers["etag"]
+    assert second.json()["current_snapshot"] == "2099H2"
+    print("✓ Current snapshot rollover invalidates /scores")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_cache_is_bounded, test_malformed_snapshot_not_cached, test_current_snapshot_rollover):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
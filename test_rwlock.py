@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Test the reader-writer lock used by DataManager."""
+
+import sys
+import threading
+import time
+import traceback
+sys.path.append('.')
+
+from backend.rwlock import ReadWriteLock
+
+# How long a blocked thread is given to prove it stays blocked
+BLOCKED_WAIT = 0.1
+
+
+def _start(target) -> threading.Thread:
+    """Run target on a daemon thread so a deadlock fails the test instead of hanging it."""
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Poll predicate until it holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+def _reader(lock: ReadWriteLock, log: list, name: str):
+    """Thread body that takes the read lock once and records when it got in."""
+    def run():
+        with lock.read_locked():
+            log.append(name)
+    return run
+
+
+def _writer(lock: ReadWriteLock, log: list, name: str):
+    """Thread body that takes the write lock once and records when it got in."""
+    def run():
+        with lock.write_locked():
+            log.append(name)
+    return run
+
+
+def test_reentrant_read():
+    """A reader can nest read locks while other readers still get in."""
+    lock = ReadWriteLock()
+    log = []
+    with lock.read_locked():
+        with lock.read_locked():
+            thread = _start(_reader(lock, log, "other reader"))
+            thread.join(2.0)
+            assert log == ["other reader"], "a second reader was blocked by a nested read"
+    assert lock._readers == 0
+    print("✓ Read lock is reentrant and shared")
+
+
+def test_reentrant_write():
+    """A writer can nest write locks; others stay out until the outermost release."""
+    lock = ReadWriteLock()
+    log = []
+    with lock.write_locked():
+        with lock.write_locked():
+            thread = _start(_reader(lock, log, "reader"))
+        time.sleep(BLOCKED_WAIT)
+        assert log == [], "a reader got in after only the inner write lock was released"
+    thread.join(2.0)
+    assert log == ["reader"]
+    print("✓ Write lock is reentrant")
+
+
+def test_read_under_own_write():
+    """The writer may read; other readers still wait for the write lock."""
+    lock = ReadWriteLock()
+    log = []
+    with lock.write_locked():
+        with lock.read_locked():
+            thread = _start(_reader(lock, log, "reader"))
+            time.sleep(BLOCKED_WAIT)
+            assert log == [], "another reader got in under the write lock"
+        # Releasing our own read lock keeps the write lock held
+        time.sleep(BLOCKED_WAIT)
+        assert log == []
+    thread.join(2.0)
+    assert log == ["reader"]
+    print("✓ Writer can read under its own write lock")
+
+
+def test_upgrade_raises():
+    """Taking the write lock while holding a read lock raises instead of deadlocking."""
+    lock = ReadWriteLock()
+    with lock.read_locked():
+        try:
+            lock.acquire_write()
+        except RuntimeError as e:
+            assert "upgrade" in str(e)
+        else:
+            raise AssertionError("upgrading a read lock did not raise")
+        assert lock._writers_waiting == 0 and lock._writer is None
+
+    # The failed upgrade leaves the lock usable
+    with lock.write_locked():
+        pass
+    print("✓ Upgrading a read lock raises RuntimeError")
+
+
+def test_waiting_writer_blocks_new_readers():
+    """Once a writer waits, new readers queue behind it instead of starving it."""
+    lock = ReadWriteLock()
+    log = []
+    lock.acquire_read()
+    try:
+        writer = _start(_writer(lock, log, "writer"))
+        assert _wait_for(lambda: lock._writers_waiting == 1), "writer never started waiting"
+        reader = _start(_reader(lock, log, "reader"))
+        time.sleep(BLOCKED_WAIT)
+        assert log == [], "a new reader got in ahead of the waiting writer"
+    finally:
+        lock.release_read()
+
+    writer.join(2.0)
+    reader.join(2.0)
+    assert log == ["writer", "reader"], log
+    print("✓ Waiting writer holds back new readers")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_reentrant_read, test_reentrant_write, test_read_under_own_write,
+                 test_upgrade_raises, test_waiting_writer_blocks_new_readers):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
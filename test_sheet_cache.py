@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test the on-disk cache of sheets parsed from the Excel workbook."""
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+import pandas as pd
+
+from backend.config import settings
+from backend.data_manager import DataManager
+
+
+def _use_cache_dir() -> str:
+    """Point the parsed-sheet cache at a fresh temporary directory."""
+    settings.DATA_CACHE_DIR = tempfile.mkdtemp()
+    return settings.DATA_CACHE_DIR
+
+
+def _copy_workbook() -> str:
+    """Copy rank.xlsx into its own temporary directory."""
+    path = os.path.join(tempfile.mkdtemp(), "rank.xlsx")
+    shutil.copy("rank.xlsx", path)
+    return path
+
+
+def test_cached_sheets_match_parse():
+    """A second load reads the cache and gets the same frames as parsing the workbook."""
+    _use_cache_dir()
+    path = _copy_workbook()
+    parsed = DataManager(path)
+    parsed.load_data()
+
+    cached = DataManager(path)
+    cached._parse_workbook = lambda kinds: (_ for _ in ()).throw(AssertionError(f"parsed {kinds}"))
+    cached.load_data()
+    for attr in ("roles_df", "scores_df", "expected_ranking_df"):
+        pd.testing.assert_frame_equal(getattr(cached, attr), getattr(parsed, attr))
+    print("✓ Cached sheets load back identically")
+
+
+def test_same_named_workbooks_keep_their_cache():
+    """Workbooks with the same file name in different directories do not evict each other."""
+    cache_dir = _use_cache_dir()
+    first, second = _copy_workbook(), _copy_workbook()
+    with pd.ExcelWriter(second, mode="a", if_sheet_exists="replace") as writer:
+        roles = pd.read_excel(second, sheet_name="Roles")
+        roles.iloc[::-1].to_excel(writer, sheet_name="Roles", index=False)
+
+    DataManager(first).load_data()
+    DataManager(second).load_data()
+    assert len(os.listdir(cache_dir)) == 6, sorted(os.listdir(cache_dir))
+    print("✓ Same-named workbooks keep separate caches")
+
+
+def test_pickled_cache_is_not_loaded():
+    """A pickle planted under a cache file name is never unpickled."""
+    cache_dir = _use_cache_dir()
+    path = _copy_workbook()
+    dm = DataManager(path)
+    dm.load_data()
+
+    marker = os.path.join(tempfile.mkdtemp(), "unpickled")
+
+    class Payload:
+        def __reduce__(self):
+            return (os.mkdir, (marker,))
+
+    for name in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, name), "wb") as f:
+            pickle.dump(Payload(), f)
+
+    reloaded = DataManager(path)
+    reloaded.load_data()
+    assert not os.path.exists(marker), "a cache file was unpickled"
+    pd.testing.assert_frame_equal(reloaded.scores_df, dm.scores_df)
+    print("✓ Planted pickles are ignored")
+
+
+if __name__ == "__main__":
+    failed = False
+    original_cache_dir = settings.DATA_CACHE_DIR
+    for test in (test_cached_sheets_match_parse, test_same_named_workbooks_keep_their_cache,
+                 test_pickled_cache_is_not_loaded):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+        finally:
+            settings.DATA_CACHE_DIR = original_cache_dir
+    sys.exit(1 if failed else 0)
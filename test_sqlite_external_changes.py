@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Test that the SQLite data manager sees writes made by other connections."""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+from backend.sqlite_data_manager import SQLiteDataManager
+from backend.ranking_engine import RankingEngine
+
+
+def _copy_database() -> str:
+    """Copy ranking.db to a temporary directory so the tests never touch the real one."""
+    db_path = os.path.join(tempfile.mkdtemp(), "ranking.db")
+    shutil.copy("ranking.db", db_path)
+    return db_path
+
+
+def _external_write(db_path: str, sql: str, params: tuple = ()) -> None:
+    """Commit a statement through a separate sqlite3 connection, like update_weights.py does."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_external_score_change():
+    """Scores and rankings follow a score committed by another connection."""
+    db_path = _copy_database()
+    dm = SQLiteDataManager(db_path)
+    engine = RankingEngine(dm)
+    snapshot = dm.get_available_snapshots()[0]
+
+    member_scores = dm.get_member_scores(snapshot=snapshot)
+    alias = next(iter(member_scores))
+    metric = next(iter(member_scores[alias]))
+    new_score = 0 if member_scores[alias][metric] else 10
+    before = {r.alias: r.weighted_score for r in engine.calculate_rankings(snapshot=snapshot)}
+    version = dm.version
+
+    _external_write(db_path, """
+        UPDATE scores SET score = ?
+        WHERE snapshot = ?
+          AND member_id = (SELECT id FROM members WHERE alias = ?)
+          AND metric_id = (SELECT id FROM metrics WHERE name = ?)
+    """, (new_score, snapshot, alias, metric))
+
+    assert dm.version != version, "version did not move after an external write"
+    assert dm.get_member_scores(snapshot=snapshot)[alias][metric] == new_score
+    assert dm.get_scores_for(alias, snapshot=snapshot)[metric] == new_score
+    after = {r.alias: r.weighted_score for r in engine.calculate_rankings(snapshot=snapshot)}
+    assert after[alias] != before[alias], "rankings were served from a stale cache"
+    print("✓ External score change is picked up")
+
+
+def test_external_roster_change():
+    """Members, roles and role counts follow a role change committed by another connection."""
+    db_path = _copy_database()
+    dm = SQLiteDataManager(db_path)
+    alias = dm.get_members()[0].alias
+    assert "Contractor" not in dm.get_roles()
+
+    _external_write(db_path, "UPDATE members SET role = 'Contractor' WHERE alias = ?", (alias,))
+
+    assert dm.get_member_by_alias(alias).role == "Contractor"
+    assert "Contractor" in dm.get_roles()
+    assert dm.get_role_counts()["Contractor"] == 1
+    print("✓ External roster change is picked up")
+
+
+def test_external_weight_change():
+    """Metric weights and weighted scores follow a weight update committed by another connection."""
+    db_path = _copy_database()
+    dm = SQLiteDataManager(db_path)
+    engine = RankingEngine(dm)
+    snapshot = dm.get_available_snapshots()[0]
+
+    metric = next(m for m in dm.get_metrics() if any(w > 0 for w in m.weights_by_role.values()))
+    role = next(r for r, w in metric.weights_by_role.items() if w > 0)
+    new_weight = int(metric.weights_by_role[role]) + 100
+    before = engine.calculate_weighted_scores(roles=[role], snapshot=snapshot)
+
+    _external_write(db_path, """
+        UPDATE metric_weights SET weight = ?
+        WHERE role = ? AND metric_id = (SELECT id FROM metrics WHERE name = ?)
+    """, (new_weight, role, metric.name))
+
+    updated = next(m for m in dm.get_metrics() if m.name == metric.name)
+    assert updated.weights_by_role[role] == new_weight, "metrics were served from a stale cache"
+    table = engine.get_role_metric_table(role)
+    assert table.weights[table.name_to_idx[metric.name]] == new_weight
+    after = engine.calculate_weighted_scores(roles=[role], snapshot=snapshot)
+    assert after != before, "weighted scores still use the old weight"
+    print("✓ External weight change is picked up")
+
+
+def test_version_stable_without_writes():
+    """Reading, or writing through the manager itself, does not keep invalidating the caches."""
+    db_path = _copy_database()
+    dm = SQLiteDataManager(db_path)
+    dm.get_members()
+    version = dm.version
+    assert dm.version == version
+
+    expected = dm.get_expected_rankings()
+    dm.update_expected_rankings([{'alias': alias, 'rank': rank} for alias, rank in expected.items()])
+    written = dm.version
+    assert written != version
+    assert dm.version == written, "our own commit was counted as an external change"
+    print("✓ Version only moves on writes")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_external_score_change, test_external_roster_change, test_external_weight_change,
+                 test_version_stable_without_writes):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)
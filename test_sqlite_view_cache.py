@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Test the per-version view cache of the SQLite data manager."""
+
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+sys.path.append('.')
+
+from backend.sqlite_data_manager import VIEW_CACHE_SIZE, SQLiteDataManager
+
+
+def _copy_database() -> str:
+    """Copy ranking.db to a temporary directory so the tests never touch the real one."""
+    db_path = os.path.join(tempfile.mkdtemp(), "ranking.db")
+    shutil.copy("ranking.db", db_path)
+    return db_path
+
+
+def test_view_cache_is_bounded():
+    """Reading many snapshots keeps at most VIEW_CACHE_SIZE views."""
+    dm = SQLiteDataManager(_copy_database())
+    for year in range(2000, 2000 + VIEW_CACHE_SIZE):
+        for half in ("H1", "H2"):
+            dm.get_score_frame(snapshot=f"{year}{half}")
+    assert len(dm._view_cache) == VIEW_CACHE_SIZE
+    print("✓ View cache stays bounded")
+
+
+def test_evicted_snapshot_reloads():
+    """A snapshot evicted from the cache is queried again with the same scores."""
+    dm = SQLiteDataManager(_copy_database())
+    snapshot = dm.get_available_snapshots()[0]
+    member_scores = dm.get_member_scores(snapshot=snapshot)
+    alias = next(iter(member_scores))
+
+    for year in range(2000, 2000 + VIEW_CACHE_SIZE):
+        dm.get_member_scores(snapshot=f"{year}H1")
+    assert ("ranking_dataset", snapshot) not in dm._view_cache
+
+    assert dm.get_scores_for(alias, snapshot=snapshot) == member_scores[alias]
+    assert dm.get_member_scores(snapshot=snapshot) == member_scores
+    print("✓ Evicted snapshots reload the same scores")
+
+
+if __name__ == "__main__":
+    failed = False
+    for test in (test_view_cache_is_bounded, test_evicted_snapshot_reloads):
+        try:
+            test()
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__} failed: {e}")
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)